@@ -1,7 +1,26 @@
+"""
+Fetch Google Places reviews for the NT attractions into data/nt_reviews.csv.
+
+Importing this module is cheap: .env, the googlemaps client and pandas are only
+loaded the first time they're needed, and the client is reused afterwards.
+
+    from google_places_reviews import fetch_place_reviews
+    rows = fetch_place_reviews([("Kings Canyon, Northern Territory", "regional")])
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
 import os
-import googlemaps
-import pandas as pd
-from dotenv import load_dotenv
+import random
+import re
+import threading
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
 
 # helper to normalise weird symbols
 def clean_text(txt):
@@ -10,10 +29,522 @@ def clean_text(txt):
     # re-encode/decode to strip weird cp1252/utf mismatches
     return txt.encode("utf-8", errors="ignore").decode("utf-8")
 
-# load API key from .env
-load_dotenv()
-API_KEY = os.getenv("GOOGLE_API_KEY")
-gmaps = googlemaps.Client(key=API_KEY)
+_env_loaded = False
+
+def env(name, default, cast=str):
+    """Read a setting from the environment / .env (loaded once, on first use)."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+    value = os.getenv(name)
+    return default if value in (None, "") else cast(value)
+
+# concurrency defaults (override with PLACES_MAX_IN_FLIGHT / PLACES_QPS in .env)
+MAX_IN_FLIGHT = 8    # places fetched at once
+PLACES_QPS = 10.0    # API calls per second, all workers
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by all workers.
+    Refills at `rate` tokens/sec and allows bursts of up to `capacity` calls.
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def set_rate(self, rate):
+        with self.lock:
+            self.rate = rate
+
+
+# retry defaults (override with PLACES_MAX_ATTEMPTS in .env)
+MAX_ATTEMPTS = 5
+RETRYABLE_STATUSES = {"OVER_QUERY_LIMIT", "RESOURCE_EXHAUSTED", "UNKNOWN_ERROR"}
+THROTTLE_STATUSES = {"OVER_QUERY_LIMIT", "RESOURCE_EXHAUSTED"}
+# googlemaps.exceptions / network errors worth another try (matched by class name
+# so googlemaps doesn't have to be imported up front)
+TRANSIENT_ERRORS = {"Timeout", "TransportError", "HTTPError", "ConnectionError", "TimeoutError"}
+
+
+class RetryPolicy:
+    """
+    Runs every API call through the shared limiter and retries retryable
+    failures with exponential backoff and full jitter. Terminal statuses
+    (ZERO_RESULTS, NOT_FOUND, ...) come straight back as a status dict.
+
+    Throttling also feeds a circuit breaker shared by all workers: each throttled
+    call halves the limiter rate, `trip_after` in a row pause every worker for
+    `cool_down` seconds, and successes creep the rate back up to the original QPS.
+    """
+    def __init__(self, limiter, max_attempts=None, base_delay=0.5, max_delay=30.0,
+                 trip_after=3, cool_down=10.0, min_rate=0.5, sleep=time.sleep):
+        self.limiter = limiter
+        self.full_rate = limiter.rate
+        self.max_attempts = max_attempts or env("PLACES_MAX_ATTEMPTS", MAX_ATTEMPTS, int)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.trip_after = trip_after
+        self.cool_down = cool_down
+        self.min_rate = min_rate
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.throttled_in_a_row = 0
+        self.open_until = 0.0
+        self.retries = 0
+        self.trips = 0
+
+    @staticmethod
+    def classify(exc):
+        """Status for an exception raised by the client, or None if it isn't an API/transport error."""
+        status = getattr(exc, "status", None)
+        if status:
+            return status
+        if type(exc).__name__ in TRANSIENT_ERRORS:
+            return "TRANSIENT"
+        return None
+
+    def call(self, fn):
+        response = None
+        for attempt in range(1, self.max_attempts + 1):
+            self._wait_if_open()
+            self.limiter.acquire()
+            try:
+                response = fn()
+            except Exception as exc:
+                status = self.classify(exc)
+                if status is None:
+                    raise
+                response = {"status": status, "error_message": str(exc)}
+            status = response.get("status", "OK")
+            if status not in RETRYABLE_STATUSES and status != "TRANSIENT":
+                self._on_success()
+                return response
+            self._on_failure(status)
+            if attempt < self.max_attempts:
+                with self.lock:
+                    self.retries += 1
+                self.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))))
+        return response
+
+    def _wait_if_open(self):
+        delay = self.open_until - time.monotonic()
+        if delay > 0:
+            self.sleep(delay)
+
+    def _on_success(self):
+        with self.lock:
+            self.throttled_in_a_row = 0
+            rate = self.limiter.rate
+        if rate < self.full_rate:
+            self.limiter.set_rate(min(self.full_rate, rate + self.full_rate * 0.05))
+
+    def _on_failure(self, status):
+        if status not in THROTTLE_STATUSES:
+            return
+        self.limiter.set_rate(max(self.min_rate, self.limiter.rate / 2))
+        with self.lock:
+            self.throttled_in_a_row += 1
+            if self.throttled_in_a_row >= self.trip_after:
+                self.open_until = time.monotonic() + self.cool_down
+                self.throttled_in_a_row = 0
+                self.trips += 1
+                print(f"⏸️ Throttled by the API, pausing all workers for {self.cool_down:.0f}s")
+
+
+# response cache defaults (override with PLACES_CACHE_* in .env;
+# PLACES_NO_CACHE=1 bypasses reads but still refreshes the cache)
+CACHE_DIR = ".places_cache"
+CACHE_TTL = 7 * 24 * 3600  # seconds
+CACHE_MAX_ENTRIES = 5000
+
+
+class CachedClient:
+    """
+    Wraps a googlemaps.Client (or StubClient) and keeps OK responses of
+    `places` / `place` as JSON files on disk, keyed by endpoint + params.
+    Entries expire after `ttl` seconds; once there are more than
+    `max_entries` files the least recently used ones are evicted.
+    With a `policy` (RetryPolicy), only cache misses go through its limiter
+    and retries, so a hit costs no token and returns straight away.
+    `fresh=True` skips the cached copy for that one call (and refreshes it).
+    Offline clients (StubClient, ...) default to a separate `stub/` cache so
+    canned responses can never be served to a real run.
+    """
+    def __init__(self, client, cache_dir=None, ttl=None, max_entries=None, bypass=None):
+        self.client = client
+        self.cache_dir = cache_dir or env("PLACES_CACHE_DIR", CACHE_DIR)
+        if cache_dir is None and getattr(client, "offline", False):
+            self.cache_dir = os.path.join(self.cache_dir, "stub")
+        self.ttl = ttl if ttl is not None else env("PLACES_CACHE_TTL", CACHE_TTL, float)
+        self.max_entries = max_entries or env("PLACES_CACHE_MAX_ENTRIES", CACHE_MAX_ENTRIES, int)
+        self.bypass = bypass if bypass is not None else env("PLACES_NO_CACHE", "") == "1"
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @property
+    def offline(self):
+        return getattr(self.client, "offline", False)
+
+    def _path(self, endpoint, params):
+        raw = json.dumps([endpoint, params], sort_keys=True, ensure_ascii=False)
+        key = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{endpoint}-{key}.json")
+
+    def _get(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry["fetched_at"] > self.ttl:
+            return None
+        try:
+            os.utime(path)  # mtime doubles as "last used" for eviction
+        except OSError:
+            pass
+        return entry["response"]
+
+    def _put(self, path, response):
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"fetched_at": time.time(), "response": response}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self):
+        files = [os.path.join(self.cache_dir, n) for n in os.listdir(self.cache_dir) if n.endswith(".json")]
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=lambda fp: os.path.getmtime(fp) if os.path.exists(fp) else 0)
+        for fp in files[:len(files) - self.max_entries]:
+            try:
+                os.remove(fp)
+            except OSError:
+                pass
+
+    def _call(self, endpoint, params, fn, policy=None, fresh=False):
+        path = self._path(endpoint, params)
+        if not (self.bypass or fresh):
+            cached = self._get(path)
+            if cached is not None:
+                with self.lock:
+                    self.hits += 1
+                return cached
+        with self.lock:
+            self.misses += 1
+        response = policy.call(fn) if policy is not None else fn()
+        if response.get("status") == "OK":
+            self._put(path, response)
+        return response
+
+    def places(self, query, policy=None, fresh=False):
+        return self._call("places", {"query": query},
+                          lambda: self.client.places(query=query), policy, fresh)
+
+    def place(self, place_id, fields=None, reviews_sort=None, policy=None, fresh=False):
+        params = {"place_id": place_id, "fields": sorted(fields) if fields else None}
+        extra = {}
+        if reviews_sort:
+            params["reviews_sort"] = extra["reviews_sort"] = reviews_sort
+        return self._call("place", params,
+                          lambda: self.client.place(place_id=place_id, fields=fields, **extra), policy, fresh)
+
+
+def call_api(gmaps, policy, endpoint, fresh=False, **params):
+    """
+    gmaps.<endpoint>(**params) under `policy`. A CachedClient applies the policy
+    to misses only (`fresh` skips its cached copy); any other client goes
+    through the policy on every call.
+    """
+    if isinstance(gmaps, CachedClient):
+        return getattr(gmaps, endpoint)(policy=policy, fresh=fresh, **params)
+    return policy.call(lambda: getattr(gmaps, endpoint)(**params))
+
+
+class StubClient:
+    """
+    Offline stand-in for googlemaps.Client with canned, deterministic responses.
+    Records every call in `self.calls` so cache behaviour can be checked without an API key.
+    """
+    offline = True  # keeps its responses / place ids away from the real cache and index
+
+    def __init__(self, reviews_per_place=3):
+        self.reviews_per_place = reviews_per_place
+        self.calls = []
+        self.names = {}
+
+    @staticmethod
+    def _place_id(query):
+        return "stub-" + hashlib.sha1(query.encode("utf-8")).hexdigest()[:16]
+
+    def places(self, query):
+        self.calls.append(("places", query))
+        place_id = self._place_id(query)
+        self.names[place_id] = query.split(",")[0]
+        return {"status": "OK", "results": [{"place_id": place_id, "name": self.names[place_id]}]}
+
+    def place(self, place_id, fields=None, reviews_sort=None):
+        self.calls.append(("place", place_id))
+        reviews = [{
+            "author_name": f"Stub reviewer {i}",
+            "text": f"Stub review {i} for {place_id}",
+            "rating": 5 - i % 5,
+            "time": 1700000000 + i,
+            "relative_time_description": f"{i + 1} months ago",
+        } for i in range(self.reviews_per_place)]
+        if reviews_sort == "newest":
+            reviews.reverse()
+        return {"status": "OK", "result": {"name": self.names.get(place_id, place_id), "rating": 4.5, "reviews": reviews}}
+
+
+class FakeApiError(Exception):
+    """Mimics googlemaps.exceptions.ApiError (carries a `status`)."""
+    def __init__(self, status, message=""):
+        super().__init__(f"{status} ({message})" if message else status)
+        self.status = status
+
+
+class FlakyClient:
+    """
+    Fault-injecting wrapper for tests: each call fails with probability
+    `fail_rate`, either by returning `{"status": ...}` or by raising like the
+    real client does (FakeApiError for API statuses, TimeoutError for transport).
+    """
+    def __init__(self, client, fail_rate=0.3, statuses=("OVER_QUERY_LIMIT", "UNKNOWN_ERROR", "TRANSIENT"),
+                 raise_errors=True, seed=None):
+        self.client = client
+        self.fail_rate = fail_rate
+        self.statuses = statuses
+        self.raise_errors = raise_errors
+        self.rng = random.Random(seed)
+        self.injected = 0
+        self.lock = threading.Lock()
+        self.offline = getattr(client, "offline", False)
+
+    def _maybe_fail(self):
+        with self.lock:
+            if self.rng.random() >= self.fail_rate:
+                return None
+            self.injected += 1
+            status = self.rng.choice(self.statuses)
+        if not self.raise_errors and status != "TRANSIENT":
+            return {"status": status}
+        if status == "TRANSIENT":
+            raise TimeoutError("injected timeout")
+        raise FakeApiError(status, "injected")
+
+    def places(self, query):
+        return self._maybe_fail() or self.client.places(query=query)
+
+    def place(self, place_id, fields=None, **kwargs):
+        return self._maybe_fail() or self.client.place(place_id=place_id, fields=fields, **kwargs)
+
+
+# place-id index defaults (override with PLACES_INDEX_* in .env)
+INDEX_PATH = "data/place_ids.json"
+STUB_INDEX_PATH = "data/place_ids.stub.json"  # offline runs (PLACES_STUB, mock server)
+INDEX_REVALIDATE = 30 * 24 * 3600  # seconds
+INDEX_MIN_CONFIDENCE = 0.5
+
+
+class PlaceIdIndex:
+    """
+    Persisted query -> place_id map so known attractions skip the text search.
+    Each entry keeps the matched name, a confidence score in [0, 1] and when it
+    was resolved; stale or low-confidence entries are re-resolved on lookup.
+    """
+    def __init__(self, path=None, revalidate_after=None, min_confidence=None):
+        self.path = path or env("PLACES_INDEX_PATH", INDEX_PATH)
+        self.revalidate_after = (revalidate_after if revalidate_after is not None
+                                 else env("PLACES_INDEX_REVALIDATE", INDEX_REVALIDATE, float))
+        self.min_confidence = (min_confidence if min_confidence is not None
+                               else env("PLACES_INDEX_MIN_CONFIDENCE", INDEX_MIN_CONFIDENCE, float))
+        self.lock = threading.Lock()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def confidence(query, results):
+        """How sure we are the top text-search hit is the attraction we asked for."""
+        top_name = results[0].get("name", "").lower()
+        wanted = query.split(",")[0].lower()
+        score = SequenceMatcher(None, wanted, top_name).ratio()
+        if len(results) == 1:
+            score = max(score, 0.9)  # a single hit is a strong signal on its own
+        return round(score, 3)
+
+    def lookup(self, query):
+        with self.lock:
+            entry = self.entries.get(query)
+        if not entry:
+            return None
+        if time.time() - entry["resolved_at"] > self.revalidate_after:
+            return None
+        if entry["confidence"] < self.min_confidence:
+            return None
+        return entry["place_id"]
+
+    def record(self, query, results):
+        top = results[0]
+        with self.lock:
+            self.entries[query] = {
+                "place_id": top["place_id"],
+                "name": top.get("name", ""),
+                "confidence": self.confidence(query, results),
+                "resolved_at": time.time(),
+            }
+
+    def forget(self, query):
+        with self.lock:
+            self.entries.pop(query, None)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with self.lock:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+# HTTP transport defaults (override with PLACES_CONNECT_TIMEOUT / PLACES_READ_TIMEOUT in .env)
+CONNECT_TIMEOUT = 5.0   # seconds
+READ_TIMEOUT = 20.0     # seconds
+# googlemaps' own 5xx retry loop bypasses the limiter and circuit breaker, so it
+# is cut short (its Timeout is retried by RetryPolicy instead)
+CLIENT_RETRY_TIMEOUT = 0.1  # seconds
+
+
+class LatencyStats:
+    """Thread-safe collector for per-request API latencies (seconds)."""
+    def __init__(self):
+        self.samples = []
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def summary(self):
+        with self.lock:
+            samples = sorted(self.samples)
+        if not samples:
+            return {"count": 0}
+        pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+        return {
+            "count": len(samples),
+            "mean_ms": 1000 * sum(samples) / len(samples),
+            "p50_ms": 1000 * pick(0.50),
+            "p95_ms": 1000 * pick(0.95),
+            "max_ms": 1000 * samples[-1],
+        }
+
+
+api_latency = LatencyStats()
+
+
+def make_session(pool_size, latency=api_latency):
+    """
+    requests.Session with a keep-alive pool of `pool_size` connections, so
+    concurrent workers reuse warm TLS connections instead of opening new ones.
+    Every response's round-trip time is recorded in `latency`.
+    """
+    import requests
+    session = requests.Session()
+    size_pool(session, pool_size)
+    session.hooks["response"].append(lambda r, *args, **kwargs: latency.record(r.elapsed.total_seconds()))
+    return session
+
+
+def size_pool(session, pool_size):
+    """(Re)mount the keep-alive pool of `session` with room for `pool_size` connections."""
+    from requests.adapters import HTTPAdapter
+    # pool_block: workers wait for a free connection rather than opening throwaway ones,
+    # so the pool must be at least as big as the number of workers
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True, max_retries=0)
+    session.mount("https://", adapter)
+    session.pool_size = pool_size
+
+
+_client = None
+_session = None
+_place_index = None
+_stub_place_index = None
+_init_lock = threading.Lock()
+
+def get_client(pool_size=None):
+    """
+    Shared, cache-wrapped client, built on first use. PLACES_STUB=1 runs offline
+    against StubClient. `pool_size` sizes the keep-alive pool (defaults to the
+    worker count); asking for a bigger pool later grows it.
+    """
+    global _client, _session
+    with _init_lock:
+        if _client is not None and _session is not None and pool_size and pool_size > _session.pool_size:
+            size_pool(_session, pool_size)
+        if _client is None:
+            if env("PLACES_STUB", "") == "1":
+                raw_client = StubClient()
+                fault_rate = env("PLACES_FAULT_RATE", 0.0, float)  # inject failures into offline runs
+                if fault_rate:
+                    raw_client = FlakyClient(raw_client, fail_rate=fault_rate)
+            else:
+                import googlemaps
+                pool_size = pool_size or env("PLACES_MAX_IN_FLIGHT", MAX_IN_FLIGHT, int)
+                _session = make_session(pool_size)
+                # OVER_QUERY_LIMIT and 5xx retries are handled by RetryPolicy across all workers
+                raw_client = googlemaps.Client(
+                    key=env("GOOGLE_API_KEY", None),
+                    retry_over_query_limit=False,
+                    retry_timeout=env("PLACES_CLIENT_RETRY_TIMEOUT", CLIENT_RETRY_TIMEOUT, float),
+                    connect_timeout=env("PLACES_CONNECT_TIMEOUT", CONNECT_TIMEOUT, float),
+                    read_timeout=env("PLACES_READ_TIMEOUT", READ_TIMEOUT, float),
+                    requests_session=_session,
+                )
+            _client = CachedClient(raw_client)
+        return _client
+
+
+def get_place_index(offline=None):
+    """
+    Shared PlaceIdIndex, loaded from disk on first use. Offline runs (defaults to
+    PLACES_STUB=1) get their own index file, so stub ids never reach the real one.
+    """
+    global _place_index, _stub_place_index
+    if offline is None:
+        offline = env("PLACES_STUB", "") == "1"
+    with _init_lock:
+        if offline:
+            if _stub_place_index is None:
+                _stub_place_index = PlaceIdIndex(path=env("PLACES_STUB_INDEX_PATH", STUB_INDEX_PATH))
+            return _stub_place_index
+        if _place_index is None:
+            _place_index = PlaceIdIndex()
+        return _place_index
+
 
 # attractions to fetch
 places = [
@@ -43,35 +574,662 @@ places = [
 ]
 
 
-all_reviews = []
+ROW_FIELDS = ["track", "source", "attraction", "review_text", "rating",
+              "review_date", "reviewer_origin", "lat", "lon", "url"]
+
+
+DETAIL_FIELDS = ['name', 'rating', 'review']
+
+
+def review_row(track, attraction, r):
+    return {
+        "track": track,
+        "source": "Google Places",
+        "attraction": attraction,
+        # 👇 use clean_text here
+        "review_text": clean_text(r.get('text', '')),
+        "rating": r.get('rating', None),
+        "review_date": r.get('relative_time_description', ''),
+        "reviewer_origin": "",  # not provided by API
+        "lat": "",
+        "lon": "",
+        "url": ""
+    }
+
+
+class RowSink:
+    """
+    Streams review rows to `path` one place at a time. Rows go to `<path>.partial`
+    and are flushed after every batch; close() renames it over `path` atomically.
+    If the run dies, the .partial file keeps every place written so far.
+    With `append=True` rows are added straight to the end of `path` instead.
+    """
+    def __init__(self, path, append=False):
+        self.path = path
+        self.append = append
+        self.tmp_path = path if append else f"{path}.partial"
+        self.count = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def _has_data(self):
+        return self.append and os.path.exists(self.path) and os.path.getsize(self.path) > 0
+
+    def write_rows(self, rows):
+        if rows:
+            self._write(rows)
+            self.count += len(rows)
+
+    def close(self):
+        self._close()
+        if not self.append:
+            os.replace(self.tmp_path, self.path)
 
-for place_name, track in places:
-    result = gmaps.places(query=place_name)
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._close()  # leave the .partial file for inspection / recovery
+
+
+class CsvSink(RowSink):
+    def __init__(self, path, append=False):
+        super().__init__(path, append)
+        has_header = self._has_data()
+        self.f = open(self.tmp_path, "a" if append else "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.f, fieldnames=ROW_FIELDS)
+        if not has_header:
+            self.writer.writeheader()
+
+    def _write(self, rows):
+        self.writer.writerows(rows)
+        self.f.flush()
+
+    def _close(self):
+        self.f.close()
+
+
+class JsonlSink(RowSink):
+    def __init__(self, path, append=False):
+        super().__init__(path, append)
+        self.f = open(self.tmp_path, "a" if append else "w", encoding="utf-8")
+
+    def _write(self, rows):
+        for row in rows:
+            self.f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.f.flush()
+
+    def _close(self):
+        self.f.close()
+
+
+class ParquetSink(RowSink):
+    """One Parquet row group per place (needs pyarrow)."""
+    def __init__(self, path, append=False):
+        if append:
+            raise ValueError("Parquet output can't be appended to; use .csv or .jsonl for incremental runs")
+        super().__init__(path)
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.schema = pa.schema([(name, pa.float64() if name == "rating" else pa.string())
+                                 for name in ROW_FIELDS])
+        self.writer = pq.ParquetWriter(self.tmp_path, self.schema)
+
+    def _write(self, rows):
+        columns = {name: [r.get(name) for r in rows] for name in ROW_FIELDS}
+        self.writer.write_table(self.pa.Table.from_pydict(columns, schema=self.schema))
+
+    def _close(self):
+        self.writer.close()
+
+
+def open_sink(path, append=False):
+    """Pick a sink from the file extension (.csv, .jsonl or .parquet)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".jsonl":
+        return JsonlSink(path, append)
+    if ext == ".parquet":
+        return ParquetSink(path, append)
+    return CsvSink(path, append)
+
+
+# review watermark defaults (override with PLACES_WATERMARK_PATH in .env)
+WATERMARK_PATH = "data/review_watermarks.json"
+STUB_WATERMARK_PATH = "data/review_watermarks.stub.json"  # PLACES_STUB runs
+
+
+class WatermarkStore:
+    """
+    Newest review seen per place_id: its unix `time` plus the authors seen at
+    exactly that time (several reviews can share a timestamp). A review is new
+    if it is newer than the watermark, or equally new from an unseen author.
+    new_reviews() only stages the advance; commit() applies it once the rows
+    are safely written, so a crash never skips reviews on the next run.
+    """
+    def __init__(self, path=None):
+        default = STUB_WATERMARK_PATH if env("PLACES_STUB", "") == "1" else WATERMARK_PATH
+        self.path = path or env("PLACES_WATERMARK_PATH", default)
+        self.lock = threading.Lock()
+        self.staged = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def reset(self):
+        with self.lock:
+            self.entries = {}
+            self.staged = {}
+
+    def new_reviews(self, place_id, reviews):
+        with self.lock:
+            mark = self.entries.get(place_id, {"time": -1, "authors": []})
+        latest, authors = mark["time"], set(mark["authors"])
+        fresh, seen = [], set()
+        for r in reviews:
+            t, author = r.get("time", 0), r.get("author_name", "")
+            if (t, author) in seen or t < latest or (t == latest and author in authors):
+                continue
+            seen.add((t, author))
+            fresh.append(r)
+        if fresh:
+            top = max(t for t, _ in seen)
+            top_authors = {a for t, a in seen if t == top}
+            if top == latest:
+                top_authors |= authors
+            with self.lock:
+                self.staged[place_id] = {"time": top, "authors": sorted(top_authors)}
+        return fresh
+
+    def commit(self, place_id):
+        with self.lock:
+            if place_id in self.staged:
+                self.entries[place_id] = self.staged.pop(place_id)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with self.lock:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def resolve_place_id(gmaps, place_index, place_name, policy):
+    """
+    Text search for `place_name`, recording the hit in `place_index`.
+    Returns (place_id, status); place_id is None if nothing was found.
+    """
+    result = call_api(gmaps, policy, "places", query=place_name)
     if result['status'] == 'OK' and result['results']:
-        place_id = result['results'][0]['place_id']
-        details = gmaps.place(place_id=place_id, fields=['name', 'rating', 'review'])
+        place_index.record(place_name, result['results'])
+        return result['results'][0]['place_id'], 'OK'
+    return None, result['status']
+
+
+def search_failed(place_name, status):
+    if status in ('OK', 'ZERO_RESULTS'):
+        return f"❌ No results found for {place_name}"
+    return f"⚠️ Gave up on {place_name} ({status})"
+
+
+def normalize_name(query):
+    """
+    'Kata Tjuta (The Olgas), Northern Territory' -> 'kata tjuta, northern territory'
+    (accents and brackets dropped). The region stays in the key: the same name in
+    two regions can be two places, and only their place_ids can tell.
+    """
+    parts = []
+    for part in query.split(","):
+        part = unicodedata.normalize("NFKD", part).encode("ascii", "ignore").decode("ascii")
+        part = re.sub(r"\(.*?\)", " ", part.lower())
+        part = " ".join(re.sub(r"[^a-z0-9]+", " ", part).split())
+        if part:
+            parts.append(part)
+    return ", ".join(parts)
+
+
+def dedupe_places(places, gmaps, place_index, policy, pool):
+    """
+    Collapse the work list before any details call: first by normalized name and
+    region (no API call at all), then by resolved place_id. Returns (work, merges):
+    `work` is [(place_name, track, (place_id, search status)), ...] in first-seen
+    order and `merges` is [(dropped, kept, reason), ...]. When duplicates
+    disagree on the track, the first entry's track wins.
+    """
+    merges = []
+    by_name = {}
+    for place_name, track in places:
+        key = normalize_name(place_name)
+        if key in by_name:
+            merges.append((place_name, by_name[key][0], "same name"))
+        else:
+            by_name[key] = (place_name, track)
+    candidates = list(by_name.values())
+
+    def resolve(place_name):
+        place_id = place_index.lookup(place_name)
+        if place_id is not None:
+            return place_id, 'OK'
+        return resolve_place_id(gmaps, place_index, place_name, policy)
+
+    work = []
+    by_id = {}
+    for (place_name, track), (place_id, status) in zip(candidates, pool.map(resolve, [c[0] for c in candidates])):
+        if place_id is not None and place_id in by_id:
+            merges.append((place_name, by_id[place_id], "same place_id"))
+            continue
+        if place_id is not None:
+            by_id[place_id] = place_name
+        work.append((place_name, track, (place_id, status)))
+    return work, merges
+
+
+def fetch_place(gmaps, place_index, place_name, track, policy, watermarks=None, resolved=None,
+                incremental=False):
+    """
+    Details (plus a text search if the id isn't indexed) for one attraction.
+    Returns (place_id, rows, status message); with `watermarks` only reviews
+    newer than the last run are turned into rows. `resolved` is a
+    (place_id, search status) pair already worked out by dedupe_places().
+    `incremental` refreshes skip cached details and ask for the newest reviews
+    instead of the API's default "most relevant" ones, so new reviews show up.
+    """
+    if resolved is not None:
+        place_id, status = resolved
+        if place_id is None:
+            return None, [], search_failed(place_name, status)
+    else:
+        place_id = place_index.lookup(place_name)
+    from_index = place_id is not None
+    if not from_index:
+        place_id, status = resolve_place_id(gmaps, place_index, place_name, policy)
+        if place_id is None:
+            return None, [], search_failed(place_name, status)
+
+    sort = {"reviews_sort": "newest"} if incremental else {}
+    get_details = lambda: call_api(gmaps, policy, "place", fresh=incremental, place_id=place_id,
+                                   fields=DETAIL_FIELDS, **sort)
+    details = get_details()
+    if details['status'] in ('NOT_FOUND', 'INVALID_REQUEST') and from_index:
+        # indexed id went stale (moved / closed place) -> resolve it again once
+        place_index.forget(place_name)
+        place_id, status = resolve_place_id(gmaps, place_index, place_name, policy)
+        if place_id is None:
+            return None, [], search_failed(place_name, status)
+        details = get_details()
+    if details['status'] != 'OK':
+        return place_id, [], f"❌ No details for {place_name} ({details['status']})"
+
+    name = details['result']['name']
+    reviews = details['result'].get('reviews', [])
+    if watermarks is None:
+        rows = [review_row(track, name, r) for r in reviews]
+        return place_id, rows, f"✅ Got {len(reviews)} reviews for {name}"
+    fresh = watermarks.new_reviews(place_id, reviews)
+    rows = [review_row(track, name, r) for r in fresh]
+    return place_id, rows, f"✅ Got {len(fresh)} new of {len(reviews)} reviews for {name}"
+
+
+def iter_place_reviews(places, max_in_flight=None, qps=None, client=None, place_index=None,
+                       watermarks=None, dedupe=True, incremental=False):
+    """
+    Yield (place_id, rows, status message) per place, in `places` order. At most
+    `max_in_flight` places are being fetched or waiting to be consumed at once,
+    so memory stays flat however long the list is. With `dedupe` the list is
+    first collapsed by dedupe_places() and the merges are printed.
+    `incremental` is passed on to fetch_place().
+    """
+    max_in_flight = max_in_flight or env("PLACES_MAX_IN_FLIGHT", MAX_IN_FLIGHT, int)
+    gmaps = client or get_client(pool_size=max_in_flight)
+    index = place_index or get_place_index(offline=getattr(gmaps, "offline", False))
+    policy = RetryPolicy(TokenBucket(qps or env("PLACES_QPS", PLACES_QPS, float)))
+    try:
+        with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+            if dedupe:
+                work, merges = dedupe_places(places, gmaps, index, policy, pool)
+                for dropped, kept, reason in merges:
+                    print(f"🔁 Skipping {dropped} -> duplicate of {kept} ({reason})")
+                todo = iter(work)
+            else:
+                todo = ((place_name, track, None) for place_name, track in places)
 
+            submit = lambda job: pool.submit(fetch_place, gmaps, index, job[0], job[1], policy, watermarks, job[2],
+                                             incremental)
+            pending = deque()
+            for job in todo:
+                pending.append(submit(job))
+                if len(pending) >= max_in_flight:
+                    break
+            while pending:
+                yield pending.popleft().result()
+                nxt = next(todo, None)
+                if nxt is not None:
+                    pending.append(submit(nxt))
+    finally:
+        index.save()
+
+
+def fetch_place_reviews(places, max_in_flight=None, qps=None, client=None, place_index=None, sink=None,
+                        watermarks=None, dedupe=True, incremental=False):
+    """
+    Fetch reviews for `places` [(query, track), ...]. Uses the shared client /
+    index unless others are passed in. Without a `sink` the rows are returned as
+    a list in `places` order; with one they are written place by place and the
+    number of rows written is returned. With a WatermarkStore only reviews newer
+    than the last run are kept; watermarks are committed once a place's rows are
+    handed off, and saved straight away when appending to a sink (otherwise
+    call watermarks.save() once the output is safe). Pass `incremental` for
+    refreshes (uncached details, newest reviews first; see fetch_place()).
+    """
+    rows = []
+    count = 0
+    for place_id, place_rows, msg in iter_place_reviews(places, max_in_flight, qps, client, place_index,
+                                                        watermarks, dedupe, incremental):
+        if sink is not None:
+            sink.write_rows(place_rows)
+        else:
+            rows.extend(place_rows)
+        count += len(place_rows)
+        if watermarks is not None and place_rows:
+            watermarks.commit(place_id)
+            if sink is not None and sink.append:
+                watermarks.save()
+        print(msg)
+    return count if sink is not None else rows
+
+
+PLACES_API_URL = "https://maps.googleapis.com/maps/api/place"
+
+
+class AsyncPlacesClient:
+    """
+    asyncio client (aiohttp) for the two endpoints this script uses: text search
+    and place details with a `fields` mask. At most `max_in_flight` requests are
+    open at once, requests are spaced to `qps`, and retryable statuses are
+    retried with backoff. Shares the place-id index with the sync fetcher.
+
+        async with AsyncPlacesClient() as client:
+            async for row in client.iter_reviews(places):
+                ...
+    """
+    def __init__(self, key=None, max_in_flight=None, qps=None, base_url=PLACES_API_URL,
+                 place_index=None, max_attempts=None):
+        self.key = key or env("GOOGLE_API_KEY", None)
+        self.max_in_flight = max_in_flight or env("PLACES_MAX_IN_FLIGHT", MAX_IN_FLIGHT, int)
+        self.qps = qps or env("PLACES_QPS", PLACES_QPS, float)
+        self.base_url = base_url.rstrip("/")
+        # anything but the real endpoint (e.g. MockPlacesServer) gets the offline index
+        self.place_index = place_index or get_place_index(offline=self.base_url != PLACES_API_URL)
+        self.max_attempts = max_attempts or env("PLACES_MAX_ATTEMPTS", MAX_ATTEMPTS, int)
+        self.session = None
+        self.semaphore = None
+        self.next_slot = 0.0
+        self.claimed_ids = {}
+
+    async def __aenter__(self):
+        import aiohttp
+        timeout = aiohttp.ClientTimeout(sock_connect=env("PLACES_CONNECT_TIMEOUT", CONNECT_TIMEOUT, float),
+                                        sock_read=env("PLACES_READ_TIMEOUT", READ_TIMEOUT, float))
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight)
+        self.session = aiohttp.ClientSession(timeout=timeout, connector=connector)
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+        self.place_index.save()
+
+    async def _throttle(self):
+        # reserve the next free slot, then sleep until it comes round
+        now = time.monotonic()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + 1.0 / self.qps
+        await asyncio.sleep(slot - now)
+
+    async def _get(self, endpoint, params):
+        import aiohttp
+        params = dict(params, key=self.key)
+        url = f"{self.base_url}/{endpoint}/json"
+        body = None
+        for attempt in range(1, self.max_attempts + 1):
+            async with self.semaphore:
+                await self._throttle()
+                start = time.monotonic()
+                try:
+                    async with self.session.get(url, params=params) as resp:
+                        if resp.status != 200:
+                            # gateway errors etc. (like googlemaps' HTTPError on the sync path)
+                            body = {"status": "TRANSIENT", "error_message": f"HTTP {resp.status}"}
+                        else:
+                            body = await resp.json(content_type=None)
+                            if not isinstance(body, dict):
+                                raise ValueError(f"unexpected response body: {body!r:.80}")
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as exc:
+                    body = {"status": "TRANSIENT", "error_message": str(exc)}
+                api_latency.record(time.monotonic() - start)
+            if body.get("status") not in RETRYABLE_STATUSES and body.get("status") != "TRANSIENT":
+                return body
+            if attempt < self.max_attempts:
+                await asyncio.sleep(random.uniform(0, min(30.0, 0.5 * 2 ** (attempt - 1))))
+        return body
+
+    async def places(self, query):
+        return await self._get("textsearch", {"query": query})
+
+    async def place(self, place_id, fields=None, reviews_sort=None):
+        params = {"place_id": place_id}
+        if fields:
+            params["fields"] = ",".join(fields)
+        if reviews_sort:
+            params["reviews_sort"] = reviews_sort
+        return await self._get("details", params)
+
+    async def fetch_place(self, place_name, track):
+        """Async twin of fetch_place(): returns (place_id, rows, status message)."""
+        place_id = self.place_index.lookup(place_name)
+        if place_id is None:
+            result = await self.places(place_name)
+            if result['status'] != 'OK' or not result.get('results'):
+                return None, [], search_failed(place_name, result['status'])
+            self.place_index.record(place_name, result['results'])
+            place_id = result['results'][0]['place_id']
+
+        # same attraction listed twice under different names -> only the first one fetches details
+        if self.claimed_ids.setdefault(place_id, place_name) != place_name:
+            return place_id, [], f"🔁 Skipping {place_name} -> duplicate of {self.claimed_ids[place_id]} (same place_id)"
+        details = await self.place(place_id, fields=DETAIL_FIELDS)
+        if details['status'] != 'OK':
+            return place_id, [], f"❌ No details for {place_name} ({details['status']})"
+        name = details['result']['name']
         reviews = details['result'].get('reviews', [])
-        for r in reviews:
-            all_reviews.append({
-                "track": track,
-                "source": "Google Places",
-                "attraction": details['result']['name'],
-                # 👇 use clean_text here
-                "review_text": clean_text(r.get('text', '')),
-                "rating": r.get('rating', None),
-                "review_date": r.get('relative_time_description', ''),
-                "reviewer_origin": "",  # not provided by API
-                "lat": "",
-                "lon": "",
-                "url": ""
-            })
-        print(f"✅ Got {len(reviews)} reviews for {details['result']['name']}")
+        return place_id, [review_row(track, name, r) for r in reviews], f"✅ Got {len(reviews)} reviews for {name}"
+
+    async def iter_reviews(self, places):
+        """Async iterator of review rows, yielded as each place completes. Duplicate attractions are skipped."""
+        by_name = {}
+        for name, track in places:
+            by_name.setdefault(normalize_name(name), (name, track))
+        tasks = [asyncio.ensure_future(self.fetch_place(name, track)) for name, track in by_name.values()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                _, rows, msg = await next_done
+                print(msg)
+                for row in rows:
+                    yield row
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+class MockPlacesServer:
+    """
+    Local HTTP server that replays canned Places JSON for the textsearch and
+    details endpoints (from StubClient unless another client is given), so
+    AsyncPlacesClient can run offline:
+
+        with MockPlacesServer() as base_url:
+            async with AsyncPlacesClient(key="test", base_url=base_url) as client:
+                ...
+    """
+    def __init__(self, client=None, port=0):
+        self.client = client or StubClient()
+        self.port = port
+        self.server = None
+        self.thread = None
+
+    def _handler(self):
+        from http.server import BaseHTTPRequestHandler
+        from urllib.parse import parse_qs, urlparse
+        client = self.client
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                qs = {k: v[0] for k, v in parse_qs(url.query).items()}
+                if url.path.endswith("/textsearch/json"):
+                    body = client.places(query=qs.get("query", ""))
+                elif url.path.endswith("/details/json"):
+                    fields = qs["fields"].split(",") if "fields" in qs else None
+                    sort = {"reviews_sort": qs["reviews_sort"]} if "reviews_sort" in qs else {}
+                    body = client.place(place_id=qs.get("place_id", ""), fields=fields, **sort)
+                else:
+                    self.send_error(404)
+                    return
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        from http.server import ThreadingHTTPServer
+        self.server = ThreadingHTTPServer(("127.0.0.1", self.port), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/maps/api/place"
+
+    def __exit__(self, exc_type, exc, tb):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def self_check():
+    """
+    Offline check of the retry policy, circuit breaker, response cache and async
+    client against StubClient / FlakyClient / MockPlacesServer. Raises
+    AssertionError on the first failure; touches nothing outside a temp dir.
+    """
+    import contextlib
+    import io
+    import tempfile
+
+    tmp = tempfile.mkdtemp(prefix="places-check-")
+    quiet = lambda: contextlib.redirect_stdout(io.StringIO())
+    places_ = [(f"Check place {i}, Northern Territory", "city") for i in range(5)]
+
+    # retries: every call ends OK even though ~30% of the attempts fail
+    flaky = FlakyClient(StubClient(), fail_rate=0.3, seed=1)
+    policy = RetryPolicy(TokenBucket(1000), max_attempts=10, min_rate=100, sleep=lambda s: None)
+    with quiet():
+        results = [policy.call(lambda: flaky.places(query=name)) for name, _ in places_ * 4]
+    assert all(r["status"] == "OK" for r in results), "retries didn't recover"
+    assert policy.retries == flaky.injected > 0, (policy.retries, flaky.injected)
+    print(f"✅ retries: {flaky.injected} injected failures, all {len(results)} calls recovered")
+
+    # circuit breaker: constant throttling halves the rate and trips the breaker
+    throttled = FlakyClient(StubClient(), fail_rate=1.0, statuses=("OVER_QUERY_LIMIT",), seed=1)
+    limiter = TokenBucket(1000)
+    policy = RetryPolicy(limiter, max_attempts=3, min_rate=1.0, sleep=lambda s: None)
+    with quiet():
+        assert policy.call(lambda: throttled.places(query="x"))["status"] == "OVER_QUERY_LIMIT"
+    assert policy.trips == 1 and limiter.rate < 1000, (policy.trips, limiter.rate)
+    print(f"✅ circuit breaker: tripped after 3 throttles, rate down to {limiter.rate:.0f}/s")
+
+    # cache: a warm rerun makes no API calls and never waits on the limiter
+    stub = StubClient()
+    cached = CachedClient(stub, cache_dir=os.path.join(tmp, "cache"))
+    for run in range(2):
+        t0 = time.perf_counter()
+        with quiet():
+            rows = fetch_place_reviews(places_[:2], qps=2, client=cached, dedupe=False,
+                                       place_index=PlaceIdIndex(path=os.path.join(tmp, f"index{run}.json")))
+        elapsed = time.perf_counter() - t0
+    assert len(rows) == 6 and cached.hits == 4 and cached.misses == 4, (len(rows), cached.hits, cached.misses)
+    assert elapsed < 0.5, f"cached rerun took {elapsed:.2f}s"
+    print(f"✅ cache: warm rerun {cached.hits} hits, 0 API calls, {elapsed:.2f}s")
+
+    # async client against the mock server, with throttling injected server-side
+    async def run_async(base_url):
+        index = PlaceIdIndex(path=os.path.join(tmp, "async-index.json"))
+        async with AsyncPlacesClient(key="check", base_url=base_url, qps=1000, place_index=index,
+                                     max_attempts=10) as client:
+            return [row async for row in client.iter_reviews(places_)]
+
+    server_client = FlakyClient(StubClient(), fail_rate=0.3, statuses=("OVER_QUERY_LIMIT",),
+                                raise_errors=False, seed=3)
+    with MockPlacesServer(server_client) as base_url, quiet():
+        rows = asyncio.run(run_async(base_url))
+    assert len(rows) == 15, len(rows)
+    print(f"✅ async client: {len(rows)} rows through {server_client.injected} injected throttles")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch Google Places reviews into CSV.")
+    parser.add_argument("--out", default="data/nt_reviews.csv", help="Output path (.csv, .jsonl or .parquet)")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="Places fetched concurrently")
+    parser.add_argument("--qps", type=float, default=None, help="API calls per second across all workers")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached responses (cache is still refreshed)")
+    parser.add_argument("--no-dedupe", action="store_true",
+                        help="Fetch every entry even if it resolves to an attraction already in the list")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Append only reviews newer than the last run instead of rewriting --out")
+    parser.add_argument("--self-check", action="store_true",
+                        help="Run the offline retry / breaker / cache / async checks and exit")
+    args = parser.parse_args()
+    if args.self_check:
+        self_check()
+        return
+
+    gmaps = get_client(pool_size=args.max_in_flight)
+    if args.no_cache:
+        gmaps.bypass = True
+
+    # a full run rebuilds the watermarks from scratch, so a later --incremental run
+    # picks up exactly where it left off
+    watermarks = WatermarkStore()
+    if not args.incremental:
+        watermarks.reset()
+
+    # rows are streamed to disk per place; a full run only replaces --out once every
+    # place is done, an incremental run appends to it directly
+    out_path = args.out
+    with open_sink(out_path, append=args.incremental) as sink:
+        total = fetch_place_reviews(places, max_in_flight=args.max_in_flight, qps=args.qps, sink=sink,
+                                    watermarks=watermarks, dedupe=not args.no_dedupe,
+                                    incremental=args.incremental)
+    watermarks.save()
+    if args.incremental:
+        print(f"\n💾 Appended {total} new reviews to {out_path}")
     else:
-        print(f"❌ No results found for {place_name}")
+        print(f"\n💾 Saved {total} total reviews to {out_path}")
+    print(f"🗄️ Cache: {gmaps.hits} hits, {gmaps.misses} API calls")
+    lat = api_latency.summary()
+    if lat["count"]:
+        print(f"⏱️ API latency over {lat['count']} requests: mean {lat['mean_ms']:.0f} ms, "
+              f"p50 {lat['p50_ms']:.0f} ms, p95 {lat['p95_ms']:.0f} ms, max {lat['max_ms']:.0f} ms")
+
 
-# save to CSV
-df = pd.DataFrame(all_reviews)
-out_path = "data/nt_reviews.csv"
-df.to_csv(out_path, index=False, encoding="utf-8")
-print(f"\n💾 Saved {len(df)} total reviews to {out_path}")
+if __name__ == "__main__":
+    main()
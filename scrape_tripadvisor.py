@@ -1,10 +1,18 @@
 import re
+import os
 import time
 import csv
 import sys
+import json
+import hashlib
 import argparse
+import subprocess
+import queue
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 import pandas as pd
 from bs4 import BeautifulSoup
@@ -12,7 +20,8 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException, TimeoutException, \
+    WebDriverException, StaleElementReferenceException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
@@ -51,12 +60,153 @@ def extract_text(el) -> str:
         return ""
 
 
-# ---------- Core scraper ----------
+# ---------- Chromedriver resolution ----------
 
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
-def get_driver(headless: bool = True) -> webdriver.Chrome:
+DRIVER_MANIFEST = Path(os.getenv("CHROMEDRIVER_MANIFEST", ".chromedriver.json"))
+CHROME_VERSION_RE = re.compile(r"(\d+)\.\d+\.\d+\.\d+")
+CHROME_VERSION_COMMANDS = [
+    ["google-chrome", "--version"],
+    ["google-chrome-stable", "--version"],
+    ["chromium", "--version"],
+    ["chromium-browser", "--version"],
+    ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome", "--version"],
+    ["reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"],
+]
+
+_driver_path: Optional[str] = None
+_driver_path_lock = threading.Lock()
+
+
+def installed_chrome_version() -> Optional[str]:
+    """Full version of the local Chrome (e.g. '120.0.6099.109'), without touching the network."""
+    for cmd in CHROME_VERSION_COMMANDS:
+        try:
+            out = subprocess.run(cmd, capture_output=True, text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        m = CHROME_VERSION_RE.search(out)
+        if m:
+            return m.group(0)
+    return None
+
+
+def resolve_chromedriver() -> str:
+    """
+    Path to a chromedriver matching the installed Chrome. Paths are pinned in
+    DRIVER_MANIFEST keyed by Chrome's major version, so normal startups are
+    fully offline; ChromeDriverManager is only asked when Chrome was upgraded
+    (or its version can't be read). Resolved once per process.
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path:
+            return _driver_path
+        t0 = time.perf_counter()
+        version = installed_chrome_version()
+        major = version.split(".")[0] if version else None
+        try:
+            manifest = json.loads(DRIVER_MANIFEST.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            manifest = {}
+
+        entry = manifest.get(major) if major else None
+        if entry and Path(entry["path"]).exists():
+            path, source = entry["path"], "manifest"
+        else:
+            path, source = ChromeDriverManager().install(), "ChromeDriverManager"
+            if major:
+                manifest[major] = {"path": path, "chrome_version": version, "resolved_at": time.time()}
+                DRIVER_MANIFEST.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+        print(f"🧭 chromedriver for Chrome {version or '?'} from {source} "
+              f"in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        _driver_path = path
+        return path
+
+
+# ---------- Resource policy ----------
+
+@dataclass
+class ResourcePolicy:
+    """
+    What the browser may skip loading. We only need the review DOM, so images,
+    fonts, media and third-party trackers are blocked by default. Only static
+    resource types are blocked by extension (never scripts, CSS or XHR, which the
+    reviews are rendered with), and tracker host rules never match `allow_hosts`.
+    """
+    enabled: bool = True
+    block_images: bool = True
+    block_fonts: bool = True
+    block_media: bool = True
+    block_hosts: List[str] = field(default_factory=lambda: [
+        "doubleclick.net", "googlesyndication.com", "google-analytics.com", "googletagmanager.com",
+        "facebook.net", "criteo.com", "criteo.net", "adsrvr.org", "scorecardresearch.com",
+        "quantserve.com", "hotjar.com", "taboola.com", "amazon-adsystem.com",
+    ])
+    allow_hosts: List[str] = field(default_factory=lambda: [
+        "tripadvisor.com", "tripadvisor.com.au", "tacdn.com", "tamgrt.com",
+    ])
+
+    def allowed(self, host: str) -> bool:
+        return any(host == a or host.endswith("." + a) or a.endswith("." + host) for a in self.allow_hosts)
+
+    def blocked_url_patterns(self) -> List[str]:
+        """URL patterns for CDP Network.setBlockedURLs ('*' wildcards)."""
+        if not self.enabled:
+            return []
+        exts = []
+        if self.block_images:
+            exts += ["png", "jpg", "jpeg", "gif", "webp", "avif"]
+        if self.block_fonts:
+            exts += ["woff", "woff2", "ttf", "otf"]
+        if self.block_media:
+            exts += ["mp4", "webm", "m3u8", "mp3"]
+        # anchored on the end of the path so e.g. "*.gif*" can't catch a "gifts" host
+        patterns = [p for ext in exts for p in (f"*.{ext}", f"*.{ext}?*")]
+        patterns += [f"*://*{host}/*" for host in self.block_hosts if not self.allowed(host)]
+        return patterns
+
+    def apply_to_options(self, chrome_options: Options) -> None:
+        """Profile-wide switches; these also cover tabs opened later."""
+        if not self.enabled:
+            return
+        prefs = {"profile.default_content_setting_values.notifications": 2}
+        if self.block_images:
+            prefs["profile.managed_default_content_settings.images"] = 2
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        if self.block_media:
+            chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        chrome_options.add_experimental_option("prefs", prefs)
+
+
+DEFAULT_RESOURCE_POLICY = ResourcePolicy()
+NO_BLOCKING = ResourcePolicy(enabled=False)
+
+
+def apply_url_blocking(driver) -> None:
+    """Install the driver's blocked URL patterns on the current tab (CDP rules are per tab)."""
+    policy = getattr(driver, "resource_policy", None)
+    patterns = policy.blocked_url_patterns() if policy else []
+    if not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except WebDriverException as e:
+        print(f"⚠️ Could not install URL blocking ({e.__class__.__name__}), loading everything")
+
+
+# ---------- Core scraper ----------
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+              "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36")
+
+
+def get_driver(headless: bool = True, resources: Optional[ResourcePolicy] = None) -> webdriver.Chrome:
+    resources = resources or DEFAULT_RESOURCE_POLICY
     chrome_options = Options()
     if headless:
         chrome_options.add_argument("--headless=new")
@@ -65,21 +215,308 @@ def get_driver(headless: bool = True) -> webdriver.Chrome:
     chrome_options.add_argument("--window-size=1400,900")
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_argument("--lang=en-US")
-    chrome_options.add_argument(
-        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
-    )
+    chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+    resources.apply_to_options(chrome_options)
 
-    # ✅ Use Service with ChromeDriverManager
-    service = Service(ChromeDriverManager().install())
+    # ✅ Use Service with the pinned chromedriver (ChromeDriverManager only on version change)
+    t0 = time.perf_counter()
+    service = Service(resolve_chromedriver())
     driver = webdriver.Chrome(service=service, options=chrome_options)
     driver.set_page_load_timeout(60)
+    driver.resource_policy = resources
+    apply_url_blocking(driver)
+    print(f"🚀 Chrome ready in {time.perf_counter() - t0:.2f}s")
     return driver
 
 
 
-def dismiss_overlays(driver):
+def reset_driver(driver) -> None:
+    """Wipe per-job browser state so the next attraction starts clean."""
+    handles = driver.window_handles
+    for h in handles[1:]:
+        driver.switch_to.window(h)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+    driver.delete_all_cookies()
+    driver.get("about:blank")
+
+
+class DriverPool:
+    """
+    Keeps `size` warm headless browsers and leases them out to scrape jobs:
+
+        with DriverPool(size=3) as pool:
+            df = scrape_tripadvisor(url, track, name, pool=pool)
+
+    Drivers are reset between jobs and replaced after `max_pages_per_driver`
+    pages (or if they crash), which keeps Chrome's memory in check.
+    """
+    def __init__(self, size: int = 2, headless: bool = True, max_pages_per_driver: int = 50,
+                 warm: bool = True, resources: Optional[ResourcePolicy] = None):
+        self.size = size
+        self.headless = headless
+        self.resources = resources
+        self.warm = warm  # False: start each browser on its first lease instead of up front
+        self.max_pages_per_driver = max_pages_per_driver
+        self.idle: "queue.Queue" = queue.Queue()
+        self.pages: Dict[int, int] = {}
+        self.lock = threading.Lock()
+        self.started = 0
+
+    def __enter__(self):
+        if not self.warm:
+            for _ in range(self.size):
+                self.idle.put(None)
+            return self
+        # start the browsers in parallel, Chrome cold start is the slow part
+        threads = [threading.Thread(target=lambda: self.idle.put(self._try_new_driver())) for _ in range(self.size)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _new_driver(self):
+        driver = get_driver(headless=self.headless, resources=self.resources)
+        with self.lock:
+            self.pages[id(driver)] = 0
+            self.started += 1
+        return driver
+
+    def _try_new_driver(self):
+        try:
+            return self._new_driver()
+        except WebDriverException as e:
+            print(f"⚠️ Could not start a browser yet ({e.__class__.__name__}), will retry on first lease")
+            return None
+
+    def _retire(self, driver) -> None:
+        with self.lock:
+            self.pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def count_page(self, driver) -> None:
+        with self.lock:
+            self.pages[id(driver)] = self.pages.get(id(driver), 0) + 1
+
+    @contextmanager
+    def lease(self):
+        driver = self.idle.get()
+        if driver is None:  # slot freed by a recycled / crashed driver
+            try:
+                driver = self._new_driver()
+            except Exception:
+                self.idle.put(None)
+                raise
+        try:
+            yield driver
+        finally:
+            self.idle.put(self._recycle(driver))
+
+    def _recycle(self, driver):
+        """Reset the driver for the next job, or retire it. Returns what goes back in the pool."""
+        with self.lock:
+            worn_out = self.pages.get(id(driver), 0) >= self.max_pages_per_driver
+        if not worn_out:
+            try:
+                reset_driver(driver)
+                return driver
+            except WebDriverException:
+                pass  # crashed / unresponsive browser
+        self._retire(driver)
+        return None
+
+    def close(self) -> None:
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            if driver is not None:
+                self._retire(driver)
+
+
+# ---------- Stage timing ----------
+
+STAGES = ["page_load", "wait", "overlay", "read_more", "extract", "pagination", "polite_delay"]
+# histogram bucket upper bounds in ms (the last bucket is everything slower)
+HISTOGRAM_BOUNDS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+
+def histogram(samples: List[float]) -> Dict[str, int]:
+    """Counts of `samples` (seconds) per HISTOGRAM_BOUNDS_MS bucket, keyed like '<=250ms'."""
+    counts = {f"<={b}ms": 0 for b in HISTOGRAM_BOUNDS_MS}
+    counts[f">{HISTOGRAM_BOUNDS_MS[-1]}ms"] = 0
+    for s in samples:
+        ms = s * 1000
+        key = next((f"<={b}ms" for b in HISTOGRAM_BOUNDS_MS if ms <= b), f">{HISTOGRAM_BOUNDS_MS[-1]}ms")
+        counts[key] += 1
+    return {k: n for k, n in counts.items() if n}
+
+
+def stage_stats(samples: List[float]) -> Dict:
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    return {
+        "count": len(samples),
+        "total_s": round(sum(samples), 3),
+        "mean_ms": round(1000 * sum(samples) / len(samples), 1),
+        "p50_ms": round(1000 * pick(0.50), 1),
+        "p95_ms": round(1000 * pick(0.95), 1),
+        "max_ms": round(1000 * samples[-1], 1),
+        "histogram": histogram(samples),
+    }
+
+
+class StageTimer:
+    """
+    Wall time of each scrape stage for one attraction, per page. Only a
+    perf_counter() pair and a list append per stage, so it stays on in production.
+
+        with timer.stage("extract", page_num):
+            ...
+    """
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.pages: Dict[int, Dict[str, float]] = {}
+
+    def add(self, stage: str, seconds: float, page_num: int = 0) -> None:
+        self.samples.setdefault(stage, []).append(seconds)
+        page = self.pages.setdefault(page_num, {})
+        page[stage] = page.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, stage: str, page_num: int = 0):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - t0, page_num)
+
+    def summary(self) -> str:
+        return "; ".join(f"{stage} {sum(self.samples[stage]):.2f}s"
+                         for stage in STAGES if stage in self.samples)
+
+    def report(self, attraction_name: str) -> Dict:
+        return {
+            "attraction": attraction_name,
+            "total_s": round(sum(sum(v) for v in self.samples.values()), 3),
+            "stages": {stage: stage_stats(self.samples[stage]) for stage in STAGES if stage in self.samples},
+            "pages": {str(n): {k: round(v, 3) for k, v in stages.items()} for n, stages in sorted(self.pages.items())},
+            "samples": {stage: [round(x, 4) for x in xs] for stage, xs in self.samples.items()},
+        }
+
+
+def timing_report(reports: List[Dict]) -> Dict:
+    """Run-wide stage stats over every attraction's StageTimer.report()."""
+    merged: Dict[str, List[float]] = {}
+    for r in reports:
+        for stage, xs in r["samples"].items():
+            merged.setdefault(stage, []).extend(xs)
+    return {
+        "stages": {stage: stage_stats(merged[stage]) for stage in STAGES if stage in merged},
+        "attractions": reports,
+    }
+
+
+def print_timing_table(report: Dict) -> None:
+    stages = report["stages"]
+    if not stages:
+        return
+    total = sum(st["total_s"] for st in stages.values()) or 1.0
+    print(f"{'stage':<13}{'count':>7}{'total s':>10}{'share':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for stage, st in stages.items():
+        print(f"{stage:<13}{st['count']:>7}{st['total_s']:>10.2f}{st['total_s'] / total:>8.1%}"
+              f"{st['mean_ms']:>10.1f}{st['p50_ms']:>10.1f}{st['p95_ms']:>10.1f}{st['max_ms']:>10.1f}")
+
+
+def concat_results(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """pd.concat that keeps each frame's timing report (concat drops differing attrs)."""
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    df.attrs["timings"] = [t for f in frames for t in f.attrs.get("timings", [])]
+    return df
+
+
+# ---------- Wait strategy ----------
+
+# per-step timeout budgets in seconds; each wait returns as soon as its condition holds
+WAIT_BUDGETS = {
+    "reviews": 15.0,     # review cards present after a page load
+    "overlay": 3.0,      # cookie banner / modal gone after clicking it away
+    "read_more": 3.0,    # truncated reviews expanded
+    "next_page": 10.0,   # old page replaced after clicking Next
+}
+
+REVIEW_IDS_JS = (
+    "return Array.from(document.querySelectorAll('[data-reviewid]'))"
+    ".map(function (e) { return e.getAttribute('data-reviewid'); });"
+)
+
+
+class Waiter:
+    """
+    WebDriverWait-based replacement for fixed sleeps. Every wait is named after
+    its step, bounded by WAIT_BUDGETS[step], and timed into `self.stats`.
+    """
+    def __init__(self, driver, budgets: Optional[Dict[str, float]] = None, poll: float = 0.1):
+        self.driver = driver
+        self.budgets = dict(WAIT_BUDGETS, **(budgets or {}))
+        self.poll = poll
+        self.stats: Dict[str, Dict] = {}
+        self.timer = StageTimer()
+
+    def until(self, step: str, condition) -> bool:
+        t0 = time.perf_counter()
+        try:
+            WebDriverWait(self.driver, self.budgets[step], poll_frequency=self.poll,
+                          ignored_exceptions=(StaleElementReferenceException,)).until(condition)
+            ok = True
+        except TimeoutException:
+            ok = False
+        st = self.stats.setdefault(step, {"count": 0, "total_s": 0.0, "max_s": 0.0, "timeouts": 0})
+        elapsed = time.perf_counter() - t0
+        st["count"] += 1
+        st["total_s"] += elapsed
+        st["max_s"] = max(st["max_s"], elapsed)
+        st["timeouts"] += 0 if ok else 1
+        return ok
+
+    def reviews_ready(self) -> bool:
+        return self.until("reviews", EC.any_of(
+            *[EC.presence_of_element_located((By.CSS_SELECTOR, sel)) for sel in REVIEW_CARD_SELECTORS[:-1]]
+        ))
+
+    def gone(self, el, step: str = "overlay") -> bool:
+        return self.until(step, EC.invisibility_of_element(el))
+
+    def review_ids(self) -> List[str]:
+        try:
+            return self.driver.execute_script(REVIEW_IDS_JS) or []
+        except WebDriverException:
+            return []
+
+    def page_changed(self, old_first_card, old_ids: List[str]) -> bool:
+        """Next page is in once the old first card went stale or the set of review ids changed."""
+        stale = EC.staleness_of(old_first_card) if old_first_card is not None else (lambda d: False)
+        return self.until("next_page", lambda d: stale(d) or (old_ids and self.review_ids() != old_ids))
+
+    def summary(self) -> str:
+        parts = [f"{step} {st['count']}x avg {st['total_s'] / st['count']:.2f}s max {st['max_s']:.2f}s"
+                 + (f" ({st['timeouts']} timeouts)" if st["timeouts"] else "")
+                 for step, st in self.stats.items()]
+        return "; ".join(parts)
+
+
+def dismiss_overlays(driver, waiter: Optional[Waiter] = None):
     """Try to close cookie banners or sign-in modals if they appear."""
+    waiter = waiter or Waiter(driver)
     # Common cookie consent buttons:
     possible_selectors = [
         "button[aria-label*='Accept']",
@@ -93,7 +530,7 @@ def dismiss_overlays(driver):
         try:
             btn = driver.find_element(By.CSS_SELECTOR, sel)
             btn.click()
-            time.sleep(1)
+            waiter.gone(btn)
             break
         except NoSuchElementException:
             pass
@@ -106,41 +543,114 @@ def dismiss_overlays(driver):
         for b in close_btns:
             try:
                 b.click()
-                time.sleep(0.5)
+                waiter.gone(b)
             except Exception:
                 continue
     except Exception:
         pass
 
 
-def click_read_more_in_card(driver, card):
+# 'Read more' toggles: buttons (or spans) labelled exactly that, so review text that
+# merely contains "more" is never clicked or waited on
+READ_MORE_LABELS = ("Read more", "More")
+READ_MORE_XPATH = (".//*[self::button or @role='button' or self::span]"
+                   "[normalize-space(.)='Read more' or normalize-space(.)='More']")
+
+
+def click_read_more_in_card(driver, card, waiter: Optional[Waiter] = None):
     """Expand truncated reviews if 'Read more' exists inside a card."""
+    waiter = waiter or Waiter(driver)
+
+    def expanded(mb):
+        # the toggle either disappears or turns into 'Read less'
+        def check(d):
+            try:
+                return (not mb.is_displayed() or mb.text.strip() not in READ_MORE_LABELS
+                        or mb.get_attribute("aria-expanded") == "true")
+            except StaleElementReferenceException:
+                return True  # re-rendered or removed by the click
+        return check
+
     try:
-        # Buttons with text like 'Read more' or 'More'
-        more_buttons = card.find_elements(By.XPATH, ".//span[contains(., 'Read more') or contains(., 'More')]")
+        more_buttons = card.find_elements(By.XPATH, READ_MORE_XPATH)
         for mb in more_buttons:
             try:
                 driver.execute_script("arguments[0].click();", mb)
-                time.sleep(0.3)
+                waiter.until("read_more", expanded(mb))
             except Exception:
                 continue
     except Exception:
         pass
 
 
+EXPAND_ALL_JS = """
+var sels = arguments[0], xpath = arguments[1], cards = [];
+for (var i = 0; i < sels.length && !cards.length; i++) {
+    cards = Array.from(document.querySelectorAll(sels[i]));
+}
+var toggles = [];
+cards.forEach(function (card) {
+    var snap = document.evaluate(xpath, card, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (var j = 0; j < snap.snapshotLength; j++) toggles.push(snap.snapshotItem(j));
+});
+// only click the innermost match (a span in a button), clicking both would collapse it again
+toggles = toggles.filter(function (el) {
+    return !toggles.some(function (o) { return o !== el && el.contains(o); });
+});
+toggles.forEach(function (el) {
+    el.setAttribute('data-ta-expanded', '1');
+    try { el.click(); } catch (e) {}
+});
+return toggles.length;
+"""
+
+EXPANDED_JS = """
+var labels = arguments[0];
+return Array.from(document.querySelectorAll('[data-ta-expanded]')).every(function (el) {
+    return !el.isConnected || el.offsetParent === null || el.getAttribute('aria-expanded') === 'true'
+        || labels.indexOf(el.textContent.trim()) < 0;
+});
+"""
+
+
+def expand_all_read_more(driver, waiter: Optional[Waiter] = None) -> int:
+    """
+    Click every 'Read more' toggle on the page in one injected script, then wait
+    once until they have all expanded. Returns how many toggles were clicked.
+    """
+    waiter = waiter or Waiter(driver)
+    try:
+        clicked = driver.execute_script(EXPAND_ALL_JS, REVIEW_CARD_SELECTORS, READ_MORE_XPATH) or 0
+    except WebDriverException:
+        return 0
+    if clicked:
+        waiter.until("read_more", lambda d: d.execute_script(EXPANDED_JS, list(READ_MORE_LABELS)))
+    return clicked
+
+
+REVIEW_CARD_SELECTORS = [
+    "div.YibKl",                 # ✅ Uluru + new TripAdvisor layout
+    "[data-test-target='review-card']",
+    "[data-test-target='HR_CC_CARD']",
+    "div[data-reviewid]",
+    "section.review-container",
+    "article"                    # fallback
+]
+RATING_SELECTOR = "[class*='ui_bubble_rating']"
+TITLE_SELECTORS = [
+    "[data-test-target='review-title']",
+    "a[href*='#REVIEWS']",
+    "a[role='button'] span",
+    "span[class*='title']"
+]
+ORIGIN_SELECTOR = "[class*='location'], [class*='HsxE']"
+
+
 def find_review_cards(driver) -> List:
     """
     Find review cards in TripAdvisor pages with multiple fallback selectors.
     """
-    selectors = [
-        "div.YibKl",                 # ✅ Uluru + new TripAdvisor layout
-        "[data-test-target='review-card']",
-        "[data-test-target='HR_CC_CARD']",
-        "div[data-reviewid]",
-        "section.review-container",
-        "article"                    # fallback
-    ]
-    for sel in selectors:
+    for sel in REVIEW_CARD_SELECTORS:
         try:
             candidates = driver.find_elements(By.CSS_SELECTOR, sel)
             if candidates:
@@ -166,18 +676,13 @@ def extract_review_from_card(card) -> Dict:
 
     # Rating
     try:
-        star = card.find_element(By.CSS_SELECTOR, "[class*='ui_bubble_rating']")
+        star = card.find_element(By.CSS_SELECTOR, RATING_SELECTOR)
         review["rating"] = parse_rating_from_classes(star.get_attribute("class").split())
     except Exception:
         review["rating"] = None
 
     # Title
-    for sel in [
-        "[data-test-target='review-title']",
-        "a[href*='#REVIEWS']",
-        "a[role='button'] span",
-        "span[class*='title']"
-    ]:
+    for sel in TITLE_SELECTORS:
         try:
             el = card.find_element(By.CSS_SELECTOR, sel)
             if extract_text(el):
@@ -229,11 +734,185 @@ def extract_review_from_card(card) -> Dict:
     return review
 
 
-def go_to_next_page(driver) -> bool:
+# ---------- Single-pass HTML extraction ----------
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+WS_RE = re.compile(r"[ \t\r\f\v]+")
+
+
+def soup_text(el) -> str:
+    """Visible-ish text of a bs4 Tag, close to what WebElement.text returns."""
+    if el is None:
+        return ""
+    for br in el.find_all("br"):
+        br.replace_with("\n")
+    text = el.get_text(" ")
+    lines = [WS_RE.sub(" ", line).strip() for line in text.split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+def find_review_cards_in_soup(soup, selectors: Optional[List[str]] = None) -> List:
+    """Same fallback order as find_review_cards(), over parsed HTML."""
+    for sel in selectors or REVIEW_CARD_SELECTORS:
+        candidates = soup.select(sel)
+        if candidates:
+            return candidates
+    return []
+
+
+def extract_review_from_tag(card) -> Dict:
+    """
+    In-process twin of extract_review_from_card() for a bs4 Tag: same fields,
+    same selector fallbacks, no WebDriver round-trips.
+    """
+    review = {
+        "title": "",
+        "text": "",
+        "rating": None,
+        "date": "",
+        "reviewer_origin": ""
+    }
+
+    star = card.select_one(RATING_SELECTOR)
+    if star is not None:
+        review["rating"] = parse_rating_from_classes(star.get("class", []))
+
+    for sel in TITLE_SELECTORS:
+        title = soup_text(card.select_one(sel))
+        if title:
+            review["title"] = title
+            break
+
+    # same order as the XPath candidates: <q>, review-text, then any span with its own text
+    text_candidates = [
+        lambda: card.find_all("q"),
+        lambda: card.select("[data-test-target='review-text']"),
+        lambda: [sp for sp in card.find_all("span", class_=True)
+                 if (sp.find(string=True, recursive=False) or "").strip()],
+    ]
+    for candidates in text_candidates:
+        strings = [t for t in (soup_text(el) for el in candidates()) if t]
+        if strings:
+            review["text"] = max(strings, key=len)
+            break
+
+    date_node = card.find(string=re.compile("Date of experience"))
+    if date_node is not None:
+        review["date"] = DATE_CLEAN_RE.sub("", soup_text(date_node.parent))
+
+    for el in card.select(ORIGIN_SELECTOR):
+        txt = soup_text(el)
+        if txt and len(txt) < 60 and any(c.isalpha() for c in txt):
+            review["reviewer_origin"] = txt
+            break
+
+    return review
+
+
+def extract_reviews_from_html(html: str, selectors: Optional[List[str]] = None) -> List[Dict]:
+    """Parse a whole page once and extract every review card from it."""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    return [extract_review_from_tag(c) for c in find_review_cards_in_soup(soup, selectors)]
+
+
+# ---------- Whole-page JS extraction ----------
+
+EXTRACT_PAGE_JS = """
+var cardSels = arguments[0], titleSels = arguments[1], ratingSel = arguments[2], originSel = arguments[3];
+function txt(el) { return el ? (el.innerText || '').trim() : ''; }
+function xpathAll(xp, ctx) {
+    var snap = document.evaluate(xp, ctx, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null), out = [];
+    for (var i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+    return out;
+}
+var cards = [];
+for (var i = 0; i < cardSels.length && !cards.length; i++) {
+    cards = Array.from(document.querySelectorAll(cardSels[i]));
+}
+return cards.map(function (card) {
+    var star = card.querySelector(ratingSel);
+    var title = '';
+    for (var i = 0; i < titleSels.length && !title; i++) title = txt(card.querySelector(titleSels[i]));
+    var text = '';
+    var textXPaths = [".//q", ".//*[@data-test-target='review-text']",
+                      ".//span[@class and string-length(normalize-space(text()))>0]"];
+    for (var i = 0; i < textXPaths.length && !text; i++) {
+        xpathAll(textXPaths[i], card).map(txt).forEach(function (t) { if (t.length > text.length) text = t; });
+    }
+    // innermost element carrying the date label
+    var dates = xpathAll(".//*[contains(., 'Date of experience')]", card);
+    var date = dates.filter(function (el) {
+        return !dates.some(function (o) { return o !== el && el.contains(o); });
+    })[0];
+    var origin = '';
+    card.querySelectorAll(originSel).forEach(function (el) {
+        var t = txt(el);
+        if (!origin && t && t.length < 60 && /\p{L}/u.test(t)) origin = t;
+    });
+    return {title: title, text: text, rating_class: star ? star.getAttribute('class') || '' : '',
+            date: txt(date), origin: origin};
+});
+"""
+
+
+def extract_reviews_js(driver) -> List[Dict]:
+    """
+    Extract every review on the page with a single execute_script call. The
+    script applies the same selector fallbacks in the browser and returns raw
+    strings; rating and date are then cleaned here with the usual helpers.
+    """
+    raw = driver.execute_script(EXTRACT_PAGE_JS, REVIEW_CARD_SELECTORS, TITLE_SELECTORS,
+                                RATING_SELECTOR, ORIGIN_SELECTOR) or []
+    return [{
+        "title": r["title"],
+        "text": r["text"],
+        "rating": parse_rating_from_classes(r["rating_class"].split()),
+        "date": DATE_CLEAN_RE.sub("", r["date"]),
+        "reviewer_origin": r["origin"],
+    } for r in raw]
+
+
+EXTRACTORS = ["soup", "js", "webdriver"]
+
+
+def extract_page_reviews(driver, extractor: str = "soup"):
+    """
+    Extract the current page with the chosen engine:
+      soup      - one page_source snapshot parsed with BeautifulSoup (default)
+      js        - one injected script returning every card as JSON
+      webdriver - the original per-element find_element walk
+    Returns (reviews, html); html is the snapshot when one was taken, else None.
+    """
+    if extractor == "js":
+        return extract_reviews_js(driver), None
+    if extractor == "webdriver":
+        return [extract_review_from_card(c) for c in find_review_cards(driver)], None
+    html = driver.page_source
+    return extract_reviews_from_html(html), html
+
+
+def _next_page_loaded(waiter: Waiter, old_first, old_ids: List[str]) -> bool:
+    # click pagination has no duplicate check, so a page that never changed must stop it
+    if waiter.page_changed(old_first, old_ids):
+        return True
+    print("⚠️ Clicked Next but the page didn't change, stopping")
+    return False
+
+
+def go_to_next_page(driver, waiter: Optional[Waiter] = None) -> bool:
     """
     Click 'Next' pagination button if present.
     Returns True if navigated to next page, else False.
     """
+    waiter = waiter or Waiter(driver)
+    cards = find_review_cards(driver)
+    old_first = cards[0] if cards else None
+    old_ids = waiter.review_ids()
     # Newer TA uses 'Next' button with aria-label, sometimes as <a>, sometimes <button>
     selectors = [
         "a[aria-label*='Next']",
@@ -246,18 +925,15 @@ def go_to_next_page(driver) -> bool:
             if "disabled" in (next_btn.get_attribute("class") or "").lower():
                 return False
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_btn)
-            time.sleep(0.3)
             next_btn.click()
-            time.sleep(1.2)  # give time to load
-            return True
+            return _next_page_loaded(waiter, old_first, old_ids)
         except NoSuchElementException:
             continue
         except ElementClickInterceptedException:
             # try JS click
             try:
                 driver.execute_script("arguments[0].click();", next_btn)
-                time.sleep(1.0)
-                return True
+                return _next_page_loaded(waiter, old_first, old_ids)
             except Exception:
                 continue
         except Exception:
@@ -270,102 +946,1011 @@ def scrape_tripadvisor(url: str,
                        attraction_name: str,
                        max_pages: int = 3,
                        polite_delay: float = 1.0,
-                       headless: bool = True) -> pd.DataFrame:
+                       headless: bool = True,
+                       pool: Optional[DriverPool] = None,
+                       extractor: str = "soup",
+                       pagination: str = "auto",
+                       tabs: int = 5,
+                       backend: str = "auto",
+                       resources: Optional[ResourcePolicy] = None,
+                       checkpoints: Optional[str] = None,
+                       resume: bool = False,
+                       corpus: Optional[str] = None) -> pd.DataFrame:
     """
     Scrape up to `max_pages` of reviews from a TripAdvisor attraction page.
+    With a `pool`, a warm browser is leased from it instead of starting a new one.
+    `extractor` picks the extraction engine (see extract_page_reviews).
+    `pagination` is "offset" (open pages 2.. from their offset URLs, `tabs` at a
+    time), "click" (follow the Next button) or "auto" (offset when the URL allows it).
+    `backend` is "http" (plain requests + BeautifulSoup, no browser), "selenium",
+    or "auto": try HTTP first and only start a browser if it finds no review cards.
+    "replay" extracts pages recorded under `corpus` (default CORPUS_DIR) instead.
+    `resources` is what a new browser skips loading (default DEFAULT_RESOURCE_POLICY).
+    With a `checkpoints` directory every page is saved as it is scraped, and
+    `resume` continues from the last completed page instead of page 1.
     """
-    driver = get_driver(headless=headless)
-    driver.get(url)
-    time.sleep(2.0)
+    if pagination == "offset" and page_url(url, 2) is None:
+        raise ValueError(f"--pagination offset needs a ...-Reviews-... URL, got {url}")
+    if backend == "replay":
+        return scrape_replay(url, track, attraction_name, max_pages, corpus or CORPUS_DIR)
 
-    dismiss_overlays(driver)
+    checkpoint = open_checkpoint(checkpoints, url, attraction_name, resume)
+    if checkpoint and checkpoint.page:
+        if checkpoint.state["exported"]:
+            print(f"⏭️ {attraction_name} already scraped and saved, skipping")
+            return pd.DataFrame()
+        if checkpoint.state["done"]:
+            return pd.DataFrame(checkpoint.rows)
+        print(f"↩️ Resuming {attraction_name} after page {checkpoint.page} ({len(checkpoint.rows)} rows)")
+
+    if backend in ("auto", "http"):
+        df = scrape_http(url, track, attraction_name, max_pages, polite_delay, checkpoint)
+        if df is not None:
+            return df
+        resumable = checkpoint is not None and checkpoint.page > 0
+        if backend == "http":
+            print(f"❌ Couldn't scrape {attraction_name} over HTTP"
+                  + (f" past page {checkpoint.page} (progress kept, rerun with --resume)" if resumable else ""))
+            return pd.DataFrame()
+        print(f"↪️ HTTP backend stopped for {attraction_name}, falling back to Selenium"
+              + (f" from page {checkpoint.page + 1}" if resumable else ""))
+
+    job = dict(url=url, track=track, attraction_name=attraction_name, max_pages=max_pages,
+               polite_delay=polite_delay, extractor=extractor, pagination=pagination, tabs=tabs,
+               checkpoint=checkpoint)
+    if pool is not None:
+        with pool.lease() as driver:
+            return _scrape_with_driver(driver, pool=pool, **job)
+    driver = get_driver(headless=headless, resources=resources)
+    try:
+        return _scrape_with_driver(driver, **job)
+    finally:
+        driver.quit()
+
+
+def scrape_many(jobs: List[Dict], pool_size: int = 2, headless: bool = True, **kwargs) -> pd.DataFrame:
+    """
+    Scrape several attractions over one DriverPool. Each job is a dict with
+    url / track / attraction_name and optionally max_pages.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    with DriverPool(size=pool_size, headless=headless, resources=kwargs.get("resources")) as pool:
+        with ThreadPoolExecutor(max_workers=pool_size) as ex:
+            frames = list(ex.map(lambda job: scrape_tripadvisor(**job, **kwargs, pool=pool), jobs))
+    return concat_results(frames)
+
+
+# ---------- Checkpoints ----------
+
+def checkpoint_key(url: str, attraction_name: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", attraction_name.lower()).strip("-")[:40]
+    return f"{slug}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:10]}"
 
-    rows = []
-    page_num = 1
 
-    while page_num <= max_pages:
-        # Wait until some reviews render
+class ScrapeCheckpoint:
+    """
+    Per-attraction progress on disk, so a run that dies on page 25 can resume at
+    page 26. Each scraped page's rows are appended to <key>.rows.jsonl right away
+    and <key>.json holds the last completed page plus the cursor: the URL of the
+    furthest page reached by clicking Next (`next_url`, page `next_page`), which
+    may lag behind the completed page after a crash. Rows are tagged with their
+    page, so rows written just before a crash (after the rows, before the state)
+    are ignored on load.
+    """
+    def __init__(self, directory: str, url: str, attraction_name: str):
+        self.dir = Path(directory)
+        key = checkpoint_key(url, attraction_name)
+        self.state_path = self.dir / f"{key}.json"
+        self.rows_path = self.dir / f"{key}.rows.jsonl"
+        self.state = {"url": url, "attraction": attraction_name, "page": 0, "next_url": None,
+                      "next_page": None, "done": False, "exported": False}
+        self.rows: List[Dict] = []
+
+    @property
+    def page(self) -> int:
+        return self.state["page"]
+
+    def load(self) -> "ScrapeCheckpoint":
         try:
-            WebDriverWait(driver, 15).until(
-                EC.any_of(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "[data-test-target='review-card']")),
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "[data-test-target='HR_CC_CARD']"))
-                )
-            )
-        except TimeoutException:
-            # try to continue anyway
-            pass
+            self.state.update(json.loads(self.state_path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            return self
+        self.rows = []
+        if self.rows_path.exists():
+            with open(self.rows_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # torn last line
+                    if entry["page"] <= self.page:
+                        self.rows.append(entry["row"])
+        return self
 
-        # DEBUG: dump part of the page to inspect
-        html_snippet = driver.page_source[:5000]  # first 5000 chars only
-        with open("debug_uluru.html", "w", encoding="utf-8") as f:
-            f.write(html_snippet)
-        print("✅ Saved debug_uluru.html (first part of page) for inspection")
+    def reset(self) -> None:
+        for path in (self.state_path, self.rows_path):
+            if path.exists():
+                path.unlink()
 
+    def _write_state(self) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.state, indent=2), encoding="utf-8")
+        os.replace(tmp, self.state_path)
 
-        cards = find_review_cards(driver)
+    def save_page(self, page_num: int, rows: List[Dict]) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with open(self.rows_path, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps({"page": page_num, "row": row}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.rows.extend(rows)
+        self.state["page"] = page_num
+        self._write_state()
 
-        for c in cards:
-            click_read_more_in_card(driver, c)
-            data = extract_review_from_card(c)
-            if not data["text"]:
-                continue
-            rows.append({
-                "track": track,
-                "source": "TripAdvisor",
-                "attraction": attraction_name,
-                "review_text": data["text"],
-                "rating": data["rating"],
-                "review_date": data["date"],
-                "reviewer_origin": data["reviewer_origin"],
-                "lat": "",
-                "lon": "",
-                "url": url
-            })
-
-        print(f"[page {page_num}] scraped {len(cards)} cards -> total rows: {len(rows)}")
-        time.sleep(polite_delay)
-
-        # Next page
-        if not go_to_next_page(driver):
+    def set_cursor(self, page_num: int, next_url: str) -> None:
+        """URL of page `page_num`, reached by clicking Next (click pagination)."""
+        self.state.update(next_url=next_url, next_page=page_num)
+        self._write_state()
+
+    def cursor(self, url: str) -> Tuple[int, str]:
+        """
+        (page, URL) to continue click pagination from: the saved cursor, or page 1
+        of `url` without one. The page can be at or before the last completed one
+        when the run died between saving a page and clicking Next; the caller
+        clicks forward from there instead of dropping the saved rows.
+        """
+        if not self.state["next_url"]:
+            return 1, url
+        # checkpoints written before next_page existed only kept the page after the last one
+        return self.state["next_page"] or self.page + 1, self.state["next_url"]
+
+    def finish(self) -> None:
+        self.state["done"] = True
+        self._write_state()
+
+    def mark_exported(self) -> None:
+        """The rows made it into the output file; --resume won't return them again."""
+        if self.state["done"]:
+            self.state["exported"] = True
+            self._write_state()
+
+
+def open_checkpoint(directory: Optional[str], url: str, attraction_name: str,
+                    resume: bool) -> Optional[ScrapeCheckpoint]:
+    """Loaded checkpoint when resuming, otherwise a fresh one (old progress for the attraction is dropped)."""
+    if not directory:
+        return None
+    checkpoint = ScrapeCheckpoint(directory, url, attraction_name)
+    if resume:
+        return checkpoint.load()
+    checkpoint.reset()
+    return checkpoint
+
+
+def mark_exported(directory: Optional[str], jobs: List[Dict]) -> None:
+    if not directory:
+        return
+    for job in jobs:
+        ScrapeCheckpoint(directory, job["url"], job["attraction_name"]).load().mark_exported()
+
+
+# ---------- Debug capture ----------
+
+# off unless TA_DEBUG_DIR is set (--debug-dir); env so manifest worker processes inherit it
+DEBUG_DIR_ENV = "TA_DEBUG_DIR"
+DEBUG_KEEP_ENV = "TA_DEBUG_KEEP"
+
+
+class DebugCapture:
+    """
+    Keeps the last `keep` full page snapshots per attraction under
+    <directory>/<attraction>/, and the last `keep` screenshots of pages whose
+    extraction failed (no cards or an exception). Files are written by a
+    background thread so the scrape loop only pays for grabbing the HTML / PNG.
+    Old files are pruned from what is on disk, so the cap also holds across
+    runs and the manifest's worker processes.
+    """
+    def __init__(self, directory: str, keep: int = 5):
+        self.dir = Path(directory)
+        self.keep = keep
+        self.queue: "queue.Queue" = queue.Queue()
+        self.thread = threading.Thread(target=self._writer, name="debug-capture", daemon=True)
+        self.thread.start()
+
+    def _path(self, attraction: str, name: str) -> Path:
+        slug = re.sub(r"[^a-z0-9]+", "-", attraction.lower()).strip("-") or "attraction"
+        return self.dir / slug / name
+
+    def snapshot(self, attraction: str, page_num: int, html: str) -> None:
+        path = self._path(attraction, f"page-{page_num:03d}-{int(time.time())}.html")
+        self.queue.put(("page-*.html", path, html.encode("utf-8")))
+
+    def screenshot(self, driver, attraction: str, page_num: int) -> None:
+        try:
+            png = driver.get_screenshot_as_png()
+        except WebDriverException:
+            return
+        path = self._path(attraction, f"failed-page-{page_num:03d}-{int(time.time())}.png")
+        self.queue.put(("failed-page-*.png", path, png))
+
+    def _writer(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            pattern, path, data = item
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(data)
+                self._prune(path.parent, pattern)
+            except OSError as e:
+                print(f"⚠️ Debug capture write failed for {path}: {e}")
+
+    def _prune(self, directory: Path, pattern: str) -> None:
+        """Delete all but the newest `keep` files matching `pattern`."""
+        def age(p: Path):
+            try:
+                return p.stat().st_mtime, p.name
+            except OSError:  # already pruned by another process
+                return 0.0, p.name
+        files = sorted(directory.glob(pattern), key=age)
+        for old in files[:max(len(files) - self.keep, 0)]:
+            old.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Finish pending writes."""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+
+_debug_capture: Optional[DebugCapture] = None
+_debug_capture_lock = threading.Lock()
+
+
+def debug_capture() -> Optional[DebugCapture]:
+    """The process's DebugCapture, or None when capture is off (the default)."""
+    global _debug_capture
+    directory = os.getenv(DEBUG_DIR_ENV)
+    if not directory:
+        return None
+    with _debug_capture_lock:
+        if _debug_capture is None:
+            from multiprocessing.util import Finalize
+            _debug_capture = DebugCapture(directory, keep=int(os.getenv(DEBUG_KEEP_ENV, "5")))
+            # runs at interpreter exit in the main process and in pool workers
+            Finalize(None, _debug_capture.close, exitpriority=20)
+        return _debug_capture
+
+
+def review_rows(reviews: List[Dict], track: str, attraction_name: str, url: str) -> List[Dict]:
+    """Turn extracted reviews into output rows (reviews without text are dropped)."""
+    return [{
+        "track": track,
+        "source": "TripAdvisor",
+        "attraction": attraction_name,
+        "review_text": data["text"],
+        "rating": data["rating"],
+        "review_date": data["date"],
+        "reviewer_origin": data["reviewer_origin"],
+        "lat": "",
+        "lon": "",
+        "url": url
+    } for data in reviews if data["text"]]
+
+
+def _scrape_page(driver, waiter: Waiter, extractor: str, attraction_name: str = "",
+                 page_num: int = 0) -> List[Dict]:
+    """Wait for the current tab's reviews, expand them and extract the whole page."""
+    timer = waiter.timer
+    # Wait until some reviews render (on timeout we try to continue anyway)
+    with timer.stage("wait", page_num):
+        waiter.reviews_ready()
+
+    # expand truncated reviews first (one script for the page), then extract the
+    # whole page in one go
+    with timer.stage("read_more", page_num):
+        expand_all_read_more(driver, waiter)
+    capture, recorder = debug_capture(), corpus_recorder()
+    if capture is None and recorder is None:
+        with timer.stage("extract", page_num):
+            reviews, _ = extract_page_reviews(driver, extractor)
+        return reviews
+
+    try:
+        with timer.stage("extract", page_num):
+            reviews, html = extract_page_reviews(driver, extractor)
+    except Exception:
+        if capture:
+            capture.screenshot(driver, attraction_name, page_num)
+        raise
+    html = html or driver.page_source
+    if recorder:
+        recorder.save(attraction_name, page_num, html)
+    if capture:
+        capture.snapshot(attraction_name, page_num, html)
+        if not reviews:
+            capture.screenshot(driver, attraction_name, page_num)
+    return reviews
+
+
+def _scrape_with_driver(driver, url: str, track: str, attraction_name: str, max_pages: int,
+                        polite_delay: float, pool: Optional[DriverPool] = None,
+                        extractor: str = "soup", pagination: str = "auto", tabs: int = 5,
+                        checkpoint: Optional[ScrapeCheckpoint] = None) -> pd.DataFrame:
+    waiter = Waiter(driver)
+    use_offsets = pagination != "click" and page_url(url, 2) is not None
+
+    # resume after the checkpoint's last page: offset URLs can be built, click
+    # pagination loads the last saved cursor and clicks Next up to the first
+    # page not scraped yet (`skip` clicks; the saved rows are kept either way)
+    start_page, start_url, skip = 1, url, 0
+    if checkpoint and checkpoint.page:
+        if use_offsets:
+            start_page, start_url = checkpoint.page + 1, page_url(url, checkpoint.page + 1)
+        else:
+            cursor_page, start_url = checkpoint.cursor(url)
+            start_page = checkpoint.page + 1
+            skip = max(start_page - cursor_page, 0)
+            if skip:
+                print(f"↪️ Cursor is at page {cursor_page}, clicking forward to page {start_page}")
+    rows = list(checkpoint.rows) if checkpoint else []
+
+    def record(page_num: int, reviews: List[Dict]) -> None:
+        new_rows = review_rows(reviews, track, attraction_name, url)
+        rows.extend(new_rows)
+        print(f"[page {page_num}] scraped {len(reviews)} cards -> total rows: {len(rows)}")
+        if checkpoint:
+            checkpoint.save_page(page_num, new_rows)
+        if pool is not None:
+            pool.count_page(driver)
+
+    timer = waiter.timer
+    if start_page <= max_pages:
+        with timer.stage("page_load", start_page):
+            driver.get(start_url)
+        with timer.stage("overlay", start_page):
+            dismiss_overlays(driver, waiter)
+
+        if use_offsets:
+            seen = {r["review_text"] for r in rows}
+            _scrape_by_offset(driver, waiter, url, max_pages, extractor, tabs, polite_delay, record,
+                              start_page=start_page, seen=seen, attraction_name=attraction_name)
+        else:
+            page_num = start_page
+            for _ in range(skip):
+                with timer.stage("pagination", page_num):
+                    moved = go_to_next_page(driver, waiter)
+                if not moved:
+                    # leave the checkpoint unfinished: saved rows stay for the next --resume
+                    raise RuntimeError(f"couldn't click through to page {start_page} "
+                                       f"(progress kept, rerun with --resume)")
+                time.sleep(polite_delay)
+            while page_num <= max_pages:
+                record(page_num, _scrape_page(driver, waiter, extractor, attraction_name, page_num))
+                with timer.stage("polite_delay", page_num):
+                    time.sleep(polite_delay)
+
+                # Next page
+                old_url = driver.current_url
+                with timer.stage("pagination", page_num + 1):
+                    moved = go_to_next_page(driver, waiter)
+                if not moved:
+                    break
+                page_num += 1
+                # some layouts paginate in place; an unchanged URL is not a cursor
+                # for this page, so the older one (clicked forward from) is kept
+                if checkpoint and driver.current_url != old_url:
+                    checkpoint.set_cursor(page_num, driver.current_url)
+
+    if checkpoint:
+        checkpoint.finish()
+    if waiter.stats:
+        print(f"⏱️ waits: {waiter.summary()}")
+    if timer.samples:
+        print(f"⏱️ stages: {timer.summary()}")
+    df = pd.DataFrame(rows)
+    df.attrs["timings"] = [timer.report(attraction_name)] if timer.samples else []
+    return df
+
+
+# ---------- Offset pagination ----------
+
+REVIEWS_PER_PAGE = 10
+REVIEWS_OFFSET_RE = re.compile(r"-Reviews(?:-or(\d+))?-")
+
+
+def page_url(url: str, page_num: int, per_page: int = REVIEWS_PER_PAGE) -> Optional[str]:
+    """
+    URL of review page `page_num` (1-based) using TripAdvisor's offset convention,
+    ...-Reviews-Uluru... -> ...-Reviews-or10-Uluru... for page 2. Offsets already in
+    `url` count as page 1. None if the URL doesn't follow the convention.
+    """
+    m = REVIEWS_OFFSET_RE.search(url)
+    if not m:
+        return None
+    offset = int(m.group(1) or 0) + (page_num - 1) * per_page
+    return url[:m.start()] + (f"-Reviews-or{offset}-" if offset else "-Reviews-") + url[m.end():]
+
+
+def _scrape_by_offset(driver, waiter: Waiter, url: str, max_pages: int, extractor: str,
+                      tabs: int, polite_delay: float, record, start_page: int = 1,
+                      seen: Optional[set] = None, attraction_name: str = "") -> None:
+    """
+    Page `start_page` (normally 1) is already loaded in the main tab. The pages
+    after it up to max_pages are opened `tabs` at a time straight from their
+    offset URLs, so they load side by side, then each tab is extracted and
+    closed. Stops at the first empty page or a page with nothing new
+    (TripAdvisor redirects offsets past the end). `seen` holds review texts
+    already scraped (e.g. from a resumed checkpoint).
+    """
+    main_handle = driver.current_window_handle
+    seen = set() if seen is None else seen
+
+    def fresh(reviews: List[Dict]) -> bool:
+        texts = {r["text"] for r in reviews if r["text"]}
+        new = texts - seen
+        seen.update(texts)
+        return bool(new)
+
+    reviews = _scrape_page(driver, waiter, extractor, attraction_name, start_page)
+    is_fresh = fresh(reviews)
+    if is_fresh or start_page == 1:
+        record(start_page, reviews)
+    if not is_fresh:
+        return
+
+    page = start_page + 1
+    while page <= max_pages:
+        batch = list(range(page, min(max_pages, page + tabs - 1) + 1))
+        opened = []
+        for n in batch:
+            with waiter.timer.stage("pagination", n):
+                driver.switch_to.new_window("tab")
+                apply_url_blocking(driver)
+                # assigning location doesn't block like driver.get, so the tabs load in parallel
+                driver.execute_script("window.location.href = arguments[0];", page_url(url, n))
+                opened.append((n, driver.current_window_handle))
+
+        done = False
+        for n, handle in opened:
+            driver.switch_to.window(handle)
+            if not done:
+                reviews = _scrape_page(driver, waiter, extractor, attraction_name, n)
+                if reviews and fresh(reviews):
+                    record(n, reviews)
+                else:
+                    done = True
+            driver.close()
+        driver.switch_to.window(main_handle)
+        if done:
+            return
+        with waiter.timer.stage("polite_delay", batch[-1]):
+            time.sleep(polite_delay)
+        page += len(batch)
+
+
+# ---------- HTTP-only backend ----------
+
+_http_session = None
+# real review card selectors only: the generic 'article' fallback would match
+# JS shells and bot walls, which must send us to Selenium instead
+HTTP_CARD_SELECTORS = REVIEW_CARD_SELECTORS[:-1]
+
+
+def get_http_session():
+    """Shared requests.Session that looks like the Selenium browser (same UA / language)."""
+    global _http_session
+    if _http_session is None:
+        import requests
+        _http_session = requests.Session()
+        _http_session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+    return _http_session
+
+
+def fetch_html(url: str, timeout: float = 20.0) -> Optional[str]:
+    """Server-rendered HTML of `url`, or None if the request fails / is blocked."""
+    import requests
+    try:
+        resp = get_http_session().get(url, timeout=timeout)
+    except requests.RequestException as e:
+        print(f"⚠️ HTTP fetch failed for {url}: {e.__class__.__name__}")
+        return None
+    if resp.status_code != 200:
+        print(f"⚠️ HTTP {resp.status_code} for {url}")
+        return None
+    return resp.text
+
+
+def scrape_http(url: str, track: str, attraction_name: str, max_pages: int = 3,
+                polite_delay: float = 1.0, checkpoint: Optional[ScrapeCheckpoint] = None) -> Optional[pd.DataFrame]:
+    """
+    Browser-free backend: fetch each review page over plain HTTP and parse it
+    with the BeautifulSoup extractor. Returns None when the first page has no
+    review cards with text (JS-only markup, bot wall, ...) or later pages can't
+    be addressed by offset URL, so the caller can fall back to Selenium.
+    With a `checkpoint`, starts after its last page and saves each new one.
+    A later page that fails to download also returns None, leaving the
+    checkpoint unfinished so Selenium (or --resume) picks up from that page.
+    """
+    if max_pages > 1 and page_url(url, 2) is None:
+        return None
+    start = checkpoint.page + 1 if checkpoint else 1
+    rows = list(checkpoint.rows) if checkpoint else []
+    seen = {r["review_text"] for r in rows}
+    timer = StageTimer()
+    for page_num in range(start, max_pages + 1):
+        with timer.stage("page_load", page_num):
+            html = fetch_html(page_url(url, page_num) or url)
+        if html is None and page_num > start:
+            # a failed fetch is not the end of the reviews
+            print(f"⚠️ HTTP fetch of page {page_num} failed for {attraction_name}")
+            return None
+        with timer.stage("extract", page_num):
+            reviews = extract_reviews_from_html(html, HTTP_CARD_SELECTORS) if html else []
+        if page_num == start and not any(r["text"] for r in reviews):
+            return None
+        if html and corpus_recorder():
+            corpus_recorder().save(attraction_name, page_num, html)
+        texts = {r["text"] for r in reviews if r["text"]}
+        if not texts - seen:
+            break  # past the last page
+        seen.update(texts)
+        new_rows = review_rows(reviews, track, attraction_name, url)
+        rows.extend(new_rows)
+        print(f"[page {page_num}] scraped {len(reviews)} cards over HTTP -> total rows: {len(rows)}")
+        if checkpoint:
+            checkpoint.save_page(page_num, new_rows)
+        if page_num < max_pages:
+            with timer.stage("polite_delay", page_num):
+                time.sleep(polite_delay)
+    if checkpoint:
+        checkpoint.finish()
+    print(f"⏱️ stages: {timer.summary()}")
+    df = pd.DataFrame(rows)
+    df.attrs["timings"] = [timer.report(attraction_name)]
+    return df
+
+
+# ---------- HTML corpus (record / replay) ----------
+
+# --record DIR sets this so manifest worker processes record too
+RECORD_DIR_ENV = "TA_RECORD_DIR"
+CORPUS_DIR = "data/corpus"
+CORPUS_FIELDS = ["title", "text", "rating", "date", "reviewer_origin"]
+
+
+def corpus_page_path(directory, attraction_name: str, page_num: int) -> Path:
+    slug = re.sub(r"[^a-z0-9]+", "-", attraction_name.lower()).strip("-") or "attraction"
+    return Path(directory) / slug / f"page-{page_num:03d}.html"
+
+
+class CorpusRecorder:
+    """Saves the HTML each page was extracted from as <dir>/<attraction>/page-NNN.html."""
+    def __init__(self, directory: str):
+        self.dir = Path(directory)
+
+    def save(self, attraction_name: str, page_num: int, html: str) -> None:
+        path = corpus_page_path(self.dir, attraction_name, page_num)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(html, encoding="utf-8")
+        os.replace(tmp, path)
+
+
+_corpus_recorder: Optional[CorpusRecorder] = None
+
+
+def corpus_recorder() -> Optional[CorpusRecorder]:
+    """The process's CorpusRecorder, or None when not recording."""
+    global _corpus_recorder
+    directory = os.getenv(RECORD_DIR_ENV)
+    if not directory:
+        return None
+    if _corpus_recorder is None or str(_corpus_recorder.dir) != str(Path(directory)):
+        _corpus_recorder = CorpusRecorder(directory)
+    return _corpus_recorder
+
+
+def scrape_replay(url: str, track: str, attraction_name: str, max_pages: int = 3,
+                  corpus: str = CORPUS_DIR) -> pd.DataFrame:
+    """
+    Offline backend: run recorded pages of `attraction_name` through the
+    BeautifulSoup extractor instead of loading them, so parser changes can be
+    checked without a browser or network.
+    """
+    rows = []
+    seen = set()
+    for page_num in range(1, max_pages + 1):
+        path = corpus_page_path(corpus, attraction_name, page_num)
+        if not path.exists():
             break
-        page_num += 1
+        reviews = extract_reviews_from_html(path.read_text(encoding="utf-8"))
+        texts = {r["text"] for r in reviews if r["text"]}
+        if not texts - seen:
+            break  # recorded past the last page
+        seen.update(texts)
+        rows.extend(review_rows(reviews, track, attraction_name, url))
+        print(f"[page {page_num}] scraped {len(reviews)} cards from {path} -> total rows: {len(rows)}")
+    if not rows:
+        print(f"❌ No recorded pages for {attraction_name} in {corpus}")
+    return pd.DataFrame(rows)
+
+
+def benchmark_corpus(corpus: str = CORPUS_DIR, repeat: int = 3) -> Dict:
+    """
+    Extract every recorded page `repeat` times and report pages/sec, cards/sec
+    and how often each field came out non-empty. Files are read up front so
+    only parsing + extraction is timed.
+    """
+    pages = {str(p): p.read_text(encoding="utf-8") for p in sorted(Path(corpus).glob("*/page-*.html"))}
+    if not pages:
+        print(f"❌ No recorded pages in {corpus}")
+        return {}
+    per_page: Dict[str, int] = {}
+    reviews: List[Dict] = []
+    t0 = time.perf_counter()
+    for run in range(repeat):
+        for name, html in pages.items():
+            found = extract_reviews_from_html(html)
+            if run == 0:
+                per_page[name] = len(found)
+                reviews.extend(found)
+    elapsed = time.perf_counter() - t0
 
-    driver.quit()
+    cards = len(reviews)
+    report = {
+        "parser": HTML_PARSER,
+        "pages": len(pages),
+        "cards": cards,
+        "empty_pages": sorted(name for name, n in per_page.items() if not n),
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(len(pages) * repeat / elapsed, 1),
+        "cards_per_sec": round(cards * repeat / elapsed, 1),
+        "fill_rates": {f: round(sum(1 for r in reviews if r[f] not in ("", None)) / cards, 3) if cards else 0.0
+                       for f in CORPUS_FIELDS},
+    }
+    print(f"📚 {report['pages']} pages, {cards} cards, {HTML_PARSER}: "
+          f"{report['pages_per_sec']} pages/s, {report['cards_per_sec']} cards/s")
+    for f, rate in report["fill_rates"].items():
+        print(f"   {f:<16} {rate:6.1%}")
+    if report["empty_pages"]:
+        print(f"⚠️ no cards on {len(report['empty_pages'])} page(s): {', '.join(report['empty_pages'][:5])}")
+    return report
+
+
+# ---------- Resource blocking benchmark ----------
+
+PAGE_WEIGHT_JS = """
+const entries = performance.getEntriesByType('resource').concat(performance.getEntriesByType('navigation'));
+return {
+  requests: entries.length,
+  bytes: entries.reduce((n, e) => n + (e.transferSize || 0), 0),
+  cards: document.querySelectorAll(arguments[0]).length,
+};
+"""
+
+
+def benchmark_resource_policy(url: str, runs: int = 3, headless: bool = True,
+                              policies: Optional[Dict[str, ResourcePolicy]] = None) -> pd.DataFrame:
+    """
+    Load `url` in a fresh browser `runs` times per policy and time navigation until
+    review cards are present. Reports median ready time, bytes transferred and the
+    number of cards found, so a policy that breaks review rendering shows up as 0 cards.
+    """
+    policies = policies or {"blocked": DEFAULT_RESOURCE_POLICY, "unblocked": NO_BLOCKING}
+    rows = []
+    for name, policy in policies.items():
+        for run in range(runs):
+            driver = get_driver(headless=headless, resources=policy)
+            try:
+                t0 = time.perf_counter()
+                try:
+                    driver.get(url)
+                except TimeoutException:
+                    pass
+                ready = Waiter(driver).reviews_ready()
+                elapsed = time.perf_counter() - t0
+                weight = driver.execute_script(PAGE_WEIGHT_JS, REVIEW_CARD_SELECTORS[0]) or {}
+            finally:
+                driver.quit()
+            rows.append({"policy": name, "run": run + 1, "ready": ready, "seconds": round(elapsed, 2),
+                         "requests": weight.get("requests"), "kb": round((weight.get("bytes") or 0) / 1024),
+                         "cards": weight.get("cards")})
+            print(f"⏱️ {name} run {run + 1}: {elapsed:.2f}s, {rows[-1]['kb']} KB, {rows[-1]['cards']} cards")
     df = pd.DataFrame(rows)
+    summary = df.groupby("policy", sort=False)[["seconds", "requests", "kb", "cards"]].median()
+    print(summary.to_string())
     return df
 
 
+# ---------- Manifest mode ----------
+
+TRACKS = ["city", "regional"]
+
+_worker_pool: Optional[DriverPool] = None
+
+
+def load_manifest(path: str, default_pages: int = 3) -> List[Dict]:
+    """
+    Read scrape jobs from a CSV or JSON manifest with url, track, attraction and
+    (optional) pages columns / keys. Returns scrape_tripadvisor() keyword dicts.
+    """
+    p = Path(path)
+    if p.suffix.lower() == ".json":
+        entries = json.loads(p.read_text(encoding="utf-8"))
+    else:
+        with open(p, newline="", encoding="utf-8") as f:
+            entries = list(csv.DictReader(f))
+
+    jobs = []
+    for i, e in enumerate(entries, start=1):
+        if e.get("track") not in TRACKS:
+            raise ValueError(f"{path} entry {i}: track must be one of {TRACKS}, got {e.get('track')!r}")
+        jobs.append({
+            "url": e["url"],
+            "track": e["track"],
+            "attraction_name": e["attraction"],
+            "max_pages": int(e.get("pages") or default_pages),
+        })
+    return jobs
+
+
+def _init_manifest_worker(headless: bool, warm: bool, resources: Optional[ResourcePolicy] = None) -> None:
+    """Each worker process keeps one browser for all the jobs it runs (started lazily unless `warm`)."""
+    global _worker_pool
+    from multiprocessing.util import Finalize
+    _worker_pool = DriverPool(size=1, headless=headless, warm=warm, resources=resources).__enter__()
+    # atexit doesn't run in pool workers, multiprocessing finalizers do
+    Finalize(None, _worker_pool.close, exitpriority=10)
+
+
+def _run_manifest_job(job: Dict, options: Dict):
+    """Runs in a worker: returns (DataFrame, None) or (None, error) so one bad job can't sink the rest."""
+    try:
+        return scrape_tripadvisor(**job, **options, pool=_worker_pool), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def scrape_manifest(jobs: List[Dict], workers: int = 3, headless: bool = True, **options) -> pd.DataFrame:
+    """
+    Scrape every manifest job on a pool of `workers` processes, each with its own
+    headless browser (reset between jobs). Results are merged in manifest order.
+    `options` are passed on to scrape_tripadvisor (extractor, pagination, ...).
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    frames = []
+    if not jobs:
+        return pd.DataFrame()
+    resources = options.pop("resources", None)  # the workers' browsers are started with it
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_manifest_worker,
+                             initargs=(headless, options.get("backend") == "selenium", resources)) as ex:
+        futures = [ex.submit(_run_manifest_job, job, options) for job in jobs]
+        for job, fut in zip(jobs, futures):
+            try:
+                df, err = fut.result()
+            except Exception as e:  # worker process died (e.g. BrokenProcessPool)
+                df, err = None, f"{type(e).__name__}: {e}"
+            if err:
+                print(f"❌ {job['attraction_name']}: {err}")
+            else:
+                print(f"✅ {job['attraction_name']}: {len(df)} rows")
+                frames.append(df)
+    return concat_results(frames)
+
+
+# ---------- Output ----------
+
+DEFAULT_OUT = "data/nt_reviews.csv"
+OUTPUT_FIELDS = ["track", "source", "attraction", "review_text", "rating", "review_date",
+                 "reviewer_origin", "lat", "lon", "url"]
+
+
+@contextmanager
+def file_lock(path: Path, timeout: float = 300.0):
+    """
+    Exclusive advisory lock on `<path>.lock`, so scrapers sharing an --out file
+    take turns appending (and compaction can't swap the file under them).
+    """
+    lock_path = Path(f"{path}.lock")
+    f = open(lock_path, "a+b")
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                if os.name == "nt":
+                    import msvcrt
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    import fcntl
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for {lock_path}")
+                time.sleep(0.1)
+        yield
+    finally:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            except OSError:
+                pass
+        f.close()  # closing releases the flock
+
+
+def read_csv_header(path: Path) -> Optional[List[str]]:
+    """Column names of an existing CSV, or None if it is missing/empty."""
+    if not path.exists() or path.stat().st_size == 0:
+        return None
+    with open(path, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), None)
+
+
+def append_rows(df: pd.DataFrame, out_path: Path) -> int:
+    """
+    Append `df` to the CSV at `out_path` without reading it back: only the header
+    line and the last byte are looked at, so the cost is O(new rows). New files
+    get a header; rows are written in the existing file's column order.
+    """
+    if df.empty:
+        return 0
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(out_path):
+        header = read_csv_header(out_path)
+        if header is None:
+            columns = [c for c in OUTPUT_FIELDS if c in df.columns] + [c for c in df.columns if c not in OUTPUT_FIELDS]
+        else:
+            extra = [c for c in df.columns if c not in header]
+            if extra:
+                raise ValueError(f"{out_path} has no column(s) {extra}; write to a new --out or compact first")
+            columns = header
+        with open(out_path, "a+b") as f:
+            if header is not None:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) not in (b"\n", b"\r")
+                f.seek(0, os.SEEK_END)
+                if needs_newline:
+                    f.write(b"\n")
+            f.write(df.reindex(columns=columns).to_csv(index=False, header=header is None).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+    return len(df)
+
+
+def compact_output(out_path: Path) -> None:
+    """Rewrite `out_path` once with exact duplicate rows (e.g. from reruns) dropped."""
+    with file_lock(out_path):
+        df = pd.read_csv(out_path, dtype=str, keep_default_na=False)
+        compacted = df.drop_duplicates()
+        tmp = Path(f"{out_path}.compact")
+        compacted.to_csv(tmp, index=False)
+        os.replace(tmp, out_path)
+    print(f"🧹 Compacted {out_path}: {len(df)} -> {len(compacted)} rows")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Scrape TripAdvisor reviews into CSV.")
-    parser.add_argument("--url", required=True, help="TripAdvisor attraction URL")
-    parser.add_argument("--track", required=True, choices=["city", "regional"], help="city or regional")
-    parser.add_argument("--attraction", required=True, help="Attraction name (for the CSV)")
+    parser.add_argument("--url", help="TripAdvisor attraction URL")
+    parser.add_argument("--track", choices=TRACKS, help="city or regional")
+    parser.add_argument("--attraction", help="Attraction name (for the CSV)")
+    parser.add_argument("--manifest", help="CSV/JSON of url, track, attraction[, pages] to scrape instead of --url")
+    parser.add_argument("--workers", type=int, default=3, help="Parallel browsers in --manifest mode")
     parser.add_argument("--pages", type=int, default=3, help="Max pages to scrape")
-    parser.add_argument("--out", default="data/nt_reviews.csv", help="Output CSV path (appends if exists)")
+    parser.add_argument("--out", help=f"Output CSV path, appended to (default {DEFAULT_OUT}; "
+                                      "--backend replay only writes when --out is given)")
     parser.add_argument("--headful", action="store_true", help="Run with a visible browser (not headless)")
+    parser.add_argument("--extract", choices=EXTRACTORS, default="soup",
+                        help="Extraction engine: parsed page_source (soup), one injected script (js) "
+                             "or per-element WebDriver calls (webdriver)")
+    parser.add_argument("--pagination", choices=["auto", "offset", "click"], default="auto",
+                        help="offset: load pages from their -orNN- URLs in parallel tabs; click: follow Next")
+    parser.add_argument("--tabs", type=int, default=5, help="Pages loaded side by side in offset pagination")
+    parser.add_argument("--backend", choices=["auto", "http", "selenium", "replay"], default="auto",
+                        help="auto: plain HTTP first, Selenium only if no review cards are found; "
+                             "replay: extract pages recorded in --corpus, no browser or network")
+    parser.add_argument("--corpus", default=CORPUS_DIR, help="Recorded pages for --backend replay")
+    parser.add_argument("--record", metavar="DIR", help="Save each scraped page's HTML under DIR")
+    parser.add_argument("--benchmark-corpus", action="store_true",
+                        help="Time extraction over the pages in --corpus and report field fill rates, then exit")
+    parser.add_argument("--no-block-resources", action="store_true",
+                        help="Let the browser load images, fonts, media and trackers")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue each attraction from its last checkpointed page")
+    parser.add_argument("--checkpoints", default="data/checkpoints",
+                        help="Directory for per-attraction progress ('' to disable)")
+    parser.add_argument("--debug-dir",
+                        help="Keep full page snapshots (and screenshots of failed pages) here; off by default")
+    parser.add_argument("--debug-keep", type=int, default=5, help="Snapshots (and failure screenshots) kept per attraction with --debug-dir")
+    parser.add_argument("--timings-out", default="data/scrape_timings.json",
+                        help="Per-stage timing report (JSON) for the run ('' to skip)")
+    parser.add_argument("--compact", action="store_true",
+                        help="Drop duplicate rows from --out (rewrites it once), then exit")
+    parser.add_argument("--benchmark-resources", type=int, metavar="RUNS",
+                        help="Time --url page loads with and without resource blocking, then exit")
     args = parser.parse_args()
+    resources = NO_BLOCKING if args.no_block_resources else DEFAULT_RESOURCE_POLICY
+    if args.benchmark_corpus:
+        benchmark_corpus(args.corpus)
+        return
+    if args.record:
+        os.environ[RECORD_DIR_ENV] = args.record
+    if args.debug_dir:
+        os.environ[DEBUG_DIR_ENV] = args.debug_dir
+        os.environ[DEBUG_KEEP_ENV] = str(args.debug_keep)
+    if args.benchmark_resources:
+        if not args.url:
+            parser.error("--benchmark-resources needs --url")
+        benchmark_resource_policy(args.url, runs=args.benchmark_resources, headless=not args.headful)
+        return
+    if args.compact:
+        compact_output(Path(args.out or DEFAULT_OUT))
+        return
+    if not args.manifest and not (args.url and args.track and args.attraction):
+        parser.error("either --manifest or all of --url, --track and --attraction are required")
+    if args.url and args.pagination == "offset" and page_url(args.url, 2) is None:
+        parser.error("--pagination offset needs a TripAdvisor ...-Reviews-... URL; use auto or click")
 
-    df = scrape_tripadvisor(
-        url=args.url,
-        track=args.track,
-        attraction_name=args.attraction,
-        max_pages=args.pages,
-        headless=not args.headful
-    )
-
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    if args.manifest:
+        jobs = load_manifest(args.manifest, default_pages=args.pages)
+        df = scrape_manifest(
+            jobs,
+            workers=args.workers,
+            headless=not args.headful,
+            extractor=args.extract,
+            pagination=args.pagination,
+            tabs=args.tabs,
+            backend=args.backend,
+            resources=resources,
+            checkpoints=args.checkpoints,
+            resume=args.resume,
+            corpus=args.corpus
+        )
+    else:
+        jobs = [{"url": args.url, "attraction_name": args.attraction}]
+        df = scrape_tripadvisor(
+            url=args.url,
+            track=args.track,
+            attraction_name=args.attraction,
+            max_pages=args.pages,
+            headless=not args.headful,
+            extractor=args.extract,
+            pagination=args.pagination,
+            tabs=args.tabs,
+            backend=args.backend,
+            resources=resources,
+            checkpoints=args.checkpoints,
+            resume=args.resume,
+            corpus=args.corpus
+        )
 
-    # Append safely
-    if out_path.exists():
-        existing = pd.read_csv(out_path)
-        combined = pd.concat([existing, df], ignore_index=True)
-        combined.to_csv(out_path, index=False)
+    if args.backend == "replay" and not args.out:
+        # offline parser runs must not feed recorded pages back into the real dataset
+        print(f"📚 Replayed {len(df)} rows (not saved, pass --out to write them)")
     else:
-        df.to_csv(out_path, index=False)
+        out_path = Path(args.out or DEFAULT_OUT)
+        saved = append_rows(df, out_path)
+
+        mark_exported(args.checkpoints, jobs)
+        print(f"Saved {saved} new rows to {out_path.resolve()}")
 
-    print(f"Saved {len(df)} new rows to {out_path.resolve()}")
+    report = timing_report(df.attrs.get("timings", []))
+    print_timing_table(report)
+    if args.timings_out and report["stages"]:
+        timings_path = Path(args.timings_out)
+        timings_path.parent.mkdir(parents=True, exist_ok=True)
+        timings_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"⏱️ Timing report written to {timings_path.resolve()}")
 
 
 if __name__ == "__main__":